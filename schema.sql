@@ -1,3 +1,8 @@
+-- Key layout: every id / *_id column below is shown as TEXT, which is the
+-- default uuid4 strategy (also used by uuid7). The generator can instead be
+-- run with --key-strategy blob (16-byte BLOB UUIDv7) or
+-- --key-strategy integer (INTEGER PRIMARY KEY rowids). In those modes
+-- every id and *_id column uses that type.
 PRAGMA foreign_keys = ON;
 
 -- 1. Organizations
@@ -13,6 +18,7 @@ CREATE TABLE IF NOT EXISTS teams (
     id TEXT PRIMARY KEY,
     org_id TEXT NOT NULL,
     name TEXT NOT NULL,
+    department TEXT,
     description TEXT,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (org_id) REFERENCES organizations(id) ON DELETE CASCADE
@@ -84,6 +90,7 @@ CREATE TABLE IF NOT EXISTS custom_field_definitions (
     org_id TEXT NOT NULL,
     name TEXT NOT NULL,
     field_type TEXT NOT NULL, 
+    enum_options TEXT, -- JSON list of allowed values for 'enum' fields
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (org_id) REFERENCES organizations(id) ON DELETE CASCADE
 );
@@ -100,7 +107,36 @@ CREATE TABLE IF NOT EXISTS custom_field_values (
     FOREIGN KEY (field_definition_id) REFERENCES custom_field_definitions(id) ON DELETE CASCADE
 );
 
--- Indexes
+-- 10. Task Events (append-only history from `python src/main.py --activity`)
+-- event_type is one of created, moved, reassigned, commented, completed.
+-- section_id / assignee_id hold the task's state right after the event.
+CREATE TABLE IF NOT EXISTS task_events (
+    id INTEGER PRIMARY KEY,
+    task_id TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    occurred_at DATETIME NOT NULL,
+    actor_id TEXT,
+    section_id TEXT,
+    assignee_id TEXT,
+    detail TEXT,
+    FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE CASCADE,
+    FOREIGN KEY (actor_id) REFERENCES users(id) ON DELETE SET NULL,
+    FOREIGN KEY (section_id) REFERENCES sections(id) ON DELETE SET NULL,
+    FOREIGN KEY (assignee_id) REFERENCES users(id) ON DELETE SET NULL
+);
+
+-- Indexes (the generator builds these after the bulk load)
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_tasks_project ON tasks(project_id);
-CREATE INDEX IF NOT EXISTS idx_tasks_assignee ON tasks(assignee_id);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_tasks_assignee ON tasks(assignee_id);
+CREATE INDEX IF NOT EXISTS idx_task_events_task ON task_events(task_id, occurred_at);
+
+-- Optional analytics layer (built by `python src/main.py --analytics`):
+-- covering indexes plus the summary tables team_member_counts,
+-- project_completion and user_workload. See src/models/analytics.py.
+CREATE INDEX IF NOT EXISTS idx_memberships_team ON team_memberships(team_id, role, user_id);
+CREATE INDEX IF NOT EXISTS idx_memberships_user ON team_memberships(user_id, team_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_section ON tasks(section_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks(is_completed);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_completed ON tasks(project_id, is_completed);
+CREATE INDEX IF NOT EXISTS idx_tasks_assignee_completed ON tasks(assignee_id, is_completed);
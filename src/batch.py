@@ -0,0 +1,230 @@
+import os
+import re
+import sys
+import json
+import time
+import logging
+import argparse
+import multiprocessing
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+logger = logging.getLogger(__name__)
+
+BATCH_DIR = "output/batch"
+DEFAULT_USERS = 5000
+DEFAULT_TEAM_SIZE = 12
+
+def _slug(name):
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_") or "org"
+
+def load_org_specs(path, base_seed=None):
+    # Either a list of org specs or {"defaults": {...}, "orgs": [...]}. A spec
+    # with "count": N expands into N orgs named "<name> 1" .. "<name> N".
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        data = {"orgs": data}
+    # A seed under "defaults" is a base seed like --seed, not one shared seed:
+    # orgs with equal seeds would get identical keys.
+    defaults = dict(data.get("defaults", {}))
+    if base_seed is None:
+        base_seed = defaults.get("seed")
+    defaults.pop("seed", None)
+
+    specs = []
+    for entry in data["orgs"]:
+        entry = {**defaults, **entry}
+        if "name" not in entry:
+            raise ValueError(f"Org spec is missing a name: {entry}")
+        count = entry.pop("count", 1)
+        seed = entry.get("seed")
+        for n in range(1, count + 1):
+            specs.append({
+                "name": entry["name"] if count == 1 else f"{entry['name']} {n}",
+                "users": int(entry.get("users", DEFAULT_USERS)),
+                "team_size": int(entry.get("team_size", DEFAULT_TEAM_SIZE)),
+                "departments": entry.get("departments"),
+                "seed": None if seed is None else int(seed) + n - 1,
+                "custom_fields": entry.get("custom_fields")
+            })
+
+    names = [spec["name"] for spec in specs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate org names in {path}: {duplicates}")
+
+    for index, spec in enumerate(specs):
+        if spec["seed"] is None and base_seed is not None:
+            spec["seed"] = base_seed + index
+    return specs
+
+def org_cost(spec):
+    # Stage 4 dominates and grows with the number of users.
+    return spec["users"]
+
+def schedule(specs, workers):
+    # Longest-processing-time first: submitting the biggest orgs first to a
+    # shared pool keeps small orgs for the tail, so cores finish together.
+    ordered = sorted(specs, key=org_cost, reverse=True)
+
+    loads = [0] * max(1, workers)
+    for spec in ordered:
+        core = loads.index(min(loads))
+        loads[core] += org_cost(spec)
+    return ordered, loads
+
+def run_org(spec):
+    import main as pipeline
+    from utils.sqlite_tuning import resolve_pragmas
+
+    logging.getLogger().setLevel(logging.WARNING)
+    start = time.perf_counter()
+    kwargs = {}
+    if spec["custom_fields"] is not None:
+        kwargs["num_custom_fields"] = spec["custom_fields"]
+
+    summary = pipeline.main(
+        num_users=spec["users"],
+        db_file=spec["db_file"],
+        company_name=spec["name"],
+        seed=spec["seed"],
+        as_of=spec["as_of"],
+        pragmas=resolve_pragmas(spec["sqlite_profile"]),
+        team_size=spec["team_size"],
+        department_mix=spec["departments"],
+        key_strategy=spec["key_strategy"],
+        **kwargs
+    )
+    summary["wall_seconds"] = time.perf_counter() - start
+    summary["db_size_mb"] = os.path.getsize(spec["db_file"]) / (1024 * 1024)
+    summary["pid"] = os.getpid()
+    return summary
+
+def merge_org_databases(shared_db, db_files):
+    from models.database import Base, create_secondary_indexes
+    from generators.work import merge_shards
+    from utils.sqlite_tuning import create_tuned_engine
+
+    engine = create_tuned_engine(f"sqlite:///{shared_db}")
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    merge_shards(engine, db_files, tables=[table.name for table in Base.metadata.sorted_tables])
+    create_secondary_indexes(engine)
+    engine.dispose()
+
+def run_batch(specs, out_dir=BATCH_DIR, workers=None, sqlite_profile="bulk", as_of=None, shared_db=None,
+              key_strategy=None):
+    from models.database import get_key_strategy
+
+    workers = workers or os.cpu_count() or 1
+    key_strategy = key_strategy or get_key_strategy()
+    os.makedirs(out_dir, exist_ok=True)
+    if shared_db:
+        if key_strategy == "integer":
+            raise ValueError("Integer keys collide across orgs; use a UUID key strategy for a shared database")
+        from scrapers.company_fetcher import company_domain
+        # Emails are unique across the shared database, so domains must be too.
+        if len({company_domain(spec["name"]) for spec in specs}) != len(specs):
+            raise ValueError("Org names must map to distinct email domains for a shared database")
+        seeds = [spec["seed"] for spec in specs if spec["seed"] is not None]
+        duplicates = sorted({seed for seed in seeds if seeds.count(seed) > 1})
+        if duplicates:
+            raise ValueError(f"Orgs with equal seeds get equal keys; duplicate seeds: {duplicates}")
+
+    for spec in specs:
+        spec["db_file"] = os.path.join(out_dir, f"{_slug(spec['name'])}.sqlite")
+        spec["as_of"] = as_of
+        spec["sqlite_profile"] = sqlite_profile
+        spec["key_strategy"] = key_strategy
+    if len({spec["db_file"] for spec in specs}) != len(specs):
+        raise ValueError("Org names must map to distinct database file names")
+
+    ordered, loads = schedule(specs, workers)
+    logger.info(
+        f"Generating {len(specs)} orgs on {workers} workers "
+        f"(planned users per core: min {min(loads)}, max {max(loads)})"
+    )
+
+    results = []
+    start = time.perf_counter()
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(specs)), mp_context=ctx) as pool:
+        futures = {pool.submit(run_org, spec): spec for spec in ordered}
+        for future in as_completed(futures):
+            spec = futures[future]
+            result = {"name": spec["name"], "users": spec["users"], "seed": spec["seed"], "db": spec["db_file"]}
+            try:
+                summary = future.result()
+                result.update({
+                    "status": "ok",
+                    "employees": summary["employees"],
+                    "teams": summary["teams"],
+                    "projects": summary["projects"],
+                    "tasks": summary["tasks"],
+                    "seconds": round(summary["wall_seconds"], 3),
+                    "db_size_mb": round(summary["db_size_mb"], 2),
+                    "pid": summary["pid"]
+                })
+                logger.info(f"   -> {spec['name']}: {summary['tasks']} tasks in {summary['wall_seconds']:.1f}s")
+            except Exception as e:
+                result.update({"status": "failed", "error": str(e)})
+                logger.error(f"   -> {spec['name']} failed: {e}")
+            results.append(result)
+
+    ok = [result for result in results if result["status"] == "ok"]
+    if shared_db and ok:
+        logger.info(f"Merging {len(ok)} org databases into {shared_db}")
+        merge_org_databases(shared_db, [result["db"] for result in ok])
+        # The per-org files are gone; only the shared file's size is reported.
+        for result in ok:
+            result["db"] = shared_db
+            del result["db_size_mb"]
+
+    order = {spec["name"]: index for index, spec in enumerate(specs)}
+    manifest = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "workers": workers,
+        "sqlite_profile": sqlite_profile,
+        "shared_db": shared_db,
+        "shared_db_size_mb": round(os.path.getsize(shared_db) / (1024 * 1024), 2) if shared_db and ok else None,
+        "key_strategy": key_strategy,
+        "wall_seconds": round(time.perf_counter() - start, 3),
+        "orgs_ok": len(ok),
+        "orgs_failed": len(results) - len(ok),
+        "orgs": sorted(results, key=lambda result: order[result["name"]])
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def main():
+    from models.database import KEY_STRATEGIES
+
+    parser = argparse.ArgumentParser(description="Generate many organizations in parallel.")
+    parser.add_argument("specs", help="JSON file with the org specs")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--out", default=BATCH_DIR, help="Directory for per-org databases and manifest.json")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Base seed; orgs without their own seed get base + position")
+    parser.add_argument("--as-of", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--sqlite-profile", default="bulk")
+    parser.add_argument("--key-strategy", choices=KEY_STRATEGIES, default=None)
+    parser.add_argument("--shared-db", default=None, metavar="PATH",
+                        help="Merge every org into this one database instead of keeping per-org files")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
+    specs = load_org_specs(args.specs, base_seed=args.seed)
+    manifest = run_batch(
+        specs, out_dir=args.out, workers=args.workers, sqlite_profile=args.sqlite_profile,
+        as_of=args.as_of, shared_db=args.shared_db, key_strategy=args.key_strategy
+    )
+    logger.info(
+        f"Batch complete: {manifest['orgs_ok']} ok, {manifest['orgs_failed']} failed "
+        f"in {manifest['wall_seconds']:.1f}s. Manifest: {os.path.join(args.out, 'manifest.json')}"
+    )
+    sys.exit(1 if manifest["orgs_failed"] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+BENCH_DIR = "output/benchmark"
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STARTUP_BUDGET_SECONDS = 1.0
+STARTUP_MODULES = ["main", "check_db"]
+# Optional dependencies that must only load when their feature is used.
+LAZY_MODULES = ["google.generativeai", "bs4", "requests", "pandas", "pyarrow", "psycopg"]
+
+def measure_startup(module):
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"lazy = {LAZY_MODULES!r}\n"
+        "print(json.dumps({'seconds': elapsed, 'eager_imports': [m for m in lazy if m in sys.modules]}))"
+    )
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def check_startup(budget=STARTUP_BUDGET_SECONDS):
+    results = {}
+    within_budget = True
+    for module in STARTUP_MODULES:
+        result = measure_startup(module)
+        result["within_budget"] = result["seconds"] <= budget and not result["eager_imports"]
+        within_budget = within_budget and result["within_budget"]
+        results[module] = result
+        logger.info(
+            f"   -> import {module}: {result['seconds']:.3f}s "
+            f"(budget {budget:.2f}s), eager optional imports: {result['eager_imports'] or 'none'}"
+        )
+    return results, within_budget
+
+def run_once(num_users, workers, sqlite_profile):
+    # Benchmarks always use fresh mock content so neither LLM latency nor a
+    # warm content cache skews the numbers.
+    import main as pipeline
+    from utils.llm_client import disable_content_cache
+    from utils.sqlite_tuning import resolve_pragmas
+
+    os.environ.pop("GEMINI_API_KEY", None)
+    disable_content_cache()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    db_file = os.path.join(BENCH_DIR, f"bench_{num_users}.sqlite")
+    start = time.perf_counter()
+    summary = pipeline.main(
+        num_users=num_users,
+        workers=workers,
+        pragmas=resolve_pragmas(sqlite_profile),
+        db_file=db_file,
+        company_name="Benchmark Corp"
+    )
+    summary["wall_seconds"] = time.perf_counter() - start
+    summary["db_size_mb"] = os.path.getsize(db_file) / (1024 * 1024)
+    os.remove(db_file)
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the generation pipeline across organization sizes.")
+    parser.add_argument("--users", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--sqlite-profile", default="bulk")
+    parser.add_argument("--out", default=os.path.join(BENCH_DIR, "report.json"))
+    parser.add_argument("--startup", action="store_true",
+                        help="Only check import time against the startup budget")
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET_SECONDS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
+    os.makedirs(BENCH_DIR, exist_ok=True)
+
+    if args.startup:
+        results, within_budget = check_startup(args.startup_budget)
+        with open(args.out, "w") as f:
+            json.dump({"startup_budget_seconds": args.startup_budget, "startup": results}, f, indent=2)
+        sys.exit(0 if within_budget else 1)
+
+    runs = []
+    ctx = multiprocessing.get_context("spawn")
+    for num_users in args.users:
+        logger.info(f"Benchmarking {num_users} users...")
+        # A fresh process per size keeps peak RSS comparable between runs.
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            summary = pool.submit(run_once, num_users, args.workers, args.sqlite_profile).result()
+        runs.append(summary)
+
+        total_rows = sum(s["rows"] for s in summary["stages"] if s["stage"] not in ("projects", "tasks"))
+        peaks = [s["peak_rss_mb"] for s in summary["stages"] if s["peak_rss_mb"] is not None]
+        logger.info(
+            f"   -> {num_users} users: {summary['wall_seconds']:.2f}s, "
+            f"{total_rows / summary['wall_seconds']:.0f} rows/sec, "
+            f"peak RSS {f'{max(peaks):.0f} MB' if peaks else 'n/a'}"
+        )
+
+    report = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "workers": args.workers,
+        "sqlite_profile": args.sqlite_profile,
+        "runs": runs
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Benchmark report written to {args.out}")
+
+if __name__ == "__main__":
+    main()
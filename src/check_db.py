@@ -1,29 +1,217 @@
 import sqlite3
 import os
-import pandas as pd
+import sys
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 DB_PATH = "output/asana_simulation.sqlite"
+VERIFY_WORKERS = os.cpu_count() or 4
+VERIFY_CHUNK_ROWS = 250000
+
+# (child table, foreign key column, parent table)
+FOREIGN_KEYS = [
+    ("teams", "org_id", "organizations"),
+    ("users", "org_id", "organizations"),
+    ("team_memberships", "user_id", "users"),
+    ("team_memberships", "team_id", "teams"),
+    ("projects", "team_id", "teams"),
+    ("sections", "project_id", "projects"),
+    ("tasks", "project_id", "projects"),
+    ("tasks", "section_id", "sections"),
+    ("tasks", "assignee_id", "users"),
+    ("custom_field_definitions", "org_id", "organizations"),
+    ("custom_field_values", "task_id", "tasks"),
+    ("custom_field_values", "field_definition_id", "custom_field_definitions"),
+    ("task_events", "task_id", "tasks"),
+    ("task_events", "actor_id", "users"),
+    ("task_events", "section_id", "sections"),
+    ("task_events", "assignee_id", "users"),
+]
+
+# Row checks run over one rowid range of their table at a time; each query
+# counts the violating rows in [?, ?].
+ROW_CHECKS = [
+    (f"fk_orphans:{child}.{column}", child, f"""
+        SELECT COUNT(*) FROM {child} c
+        WHERE c.rowid BETWEEN ? AND ? AND c.{column} IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM {parent} p WHERE p.id = c.{column})
+    """)
+    for child, column, parent in FOREIGN_KEYS
+] + [
+    ("due_date_before_created_at", "tasks", """
+        SELECT COUNT(*) FROM tasks
+        WHERE rowid BETWEEN ? AND ? AND due_date < created_at
+    """),
+    ("completed_before_created_at", "tasks", """
+        SELECT COUNT(*) FROM tasks
+        WHERE rowid BETWEEN ? AND ? AND completed_at < created_at
+    """),
+    ("completion_flag_mismatch", "tasks", """
+        SELECT COUNT(*) FROM tasks
+        WHERE rowid BETWEEN ? AND ? AND (is_completed = 1) != (completed_at IS NOT NULL)
+    """),
+    ("task_section_in_other_project", "tasks", """
+        SELECT COUNT(*) FROM tasks t
+        WHERE t.rowid BETWEEN ? AND ?
+          AND NOT EXISTS (SELECT 1 FROM sections s WHERE s.id = t.section_id AND s.project_id = t.project_id)
+    """),
+    ("event_before_task_created", "task_events", """
+        SELECT COUNT(*) FROM task_events e JOIN tasks t ON t.id = e.task_id
+        WHERE e.rowid BETWEEN ? AND ? AND e.occurred_at < t.created_at
+    """),
+    ("custom_field_type_mismatch", "custom_field_values", """
+        SELECT COUNT(*) FROM custom_field_values v
+        JOIN custom_field_definitions d ON d.id = v.field_definition_id
+        WHERE v.rowid BETWEEN ? AND ? AND NOT (
+            (d.field_type = 'number' AND v.value_number IS NOT NULL AND v.value_text IS NULL)
+            OR (d.field_type = 'text' AND v.value_text IS NOT NULL AND v.value_number IS NULL)
+            OR (d.field_type = 'enum' AND v.value_number IS NULL
+                AND v.value_text IN (SELECT value FROM json_each(d.enum_options)))
+        )
+    """),
+]
+
+# Whole-table checks that aggregate across rows and cannot be split by rowid.
+TABLE_CHECKS = [
+    ("duplicate_emails", """
+        SELECT COUNT(*) - COUNT(DISTINCT email) FROM users
+    """),
+    ("teams_without_exactly_one_admin", """
+        SELECT COUNT(*) FROM (
+            SELECT t.id FROM teams t
+            LEFT JOIN team_memberships m ON m.team_id = t.id
+            GROUP BY t.id
+            HAVING COALESCE(SUM(m.role = 'admin'), 0) != 1
+        )
+    """),
+]
+
+def format_table(headers, rows):
+    cells = [[str(h) for h in headers]] + [["" if v is None else str(v) for v in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    return "\n".join(
+        " ".join(value.rjust(width) for value, width in zip(row, widths))
+        for row in cells
+    )
+
+def has_table(conn, name):
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone()
+    return row is not None
 
 def run_query(conn, query, description):
     print(f"\n--- {description} ---")
     try:
-        df = pd.read_sql_query(query, conn)
-        if df.empty:
+        cursor = conn.execute(query)
+        rows = cursor.fetchall()
+        if not rows:
             print("Result: Empty")
         else:
-            print(df.to_string(index=False))
+            print(format_table([d[0] for d in cursor.description], rows))
     except Exception as e:
         print(f"Error: {e}")
 
-def main():
-    if not os.path.exists(DB_PATH):
-        print(f"Database file not found at {DB_PATH}")
+class _Connections:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._all = []
+        self._lock = threading.Lock()
+
+    def get(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+            self._local.conn = conn
+            with self._lock:
+                self._all.append(conn)
+        return conn
+
+    def close(self):
+        for conn in self._all:
+            conn.close()
+
+def _rowid_ranges(conn, table, chunk_rows):
+    # Boundaries come from keyset pagination over the rowids that exist, so
+    # sparse rowids (integer keys in per-shard ranges) don't yield empty chunks.
+    low, high = conn.execute(f"SELECT MIN(rowid), MAX(rowid) FROM {table}").fetchone()
+    ranges = []
+    while low is not None:
+        row = conn.execute(
+            f"SELECT rowid FROM {table} WHERE rowid >= ? ORDER BY rowid LIMIT 1 OFFSET ?", (low, chunk_rows)
+        ).fetchone()
+        next_low = row[0] if row else None
+        ranges.append((low, high if next_low is None else next_low - 1))
+        low = next_low
+    return ranges
+
+def verify(db_path=DB_PATH, workers=VERIFY_WORKERS, chunk_rows=VERIFY_CHUNK_ROWS):
+    start = time.perf_counter()
+    connections = _Connections(db_path)
+    results = {}
+
+    def run_chunk(name, query, params):
+        chunk_start = time.perf_counter()
+        (count,) = connections.get().execute(query, params).fetchone()
+        return name, count or 0, time.perf_counter() - chunk_start
+
+    try:
+        conn = connections.get()
+        jobs = []
+        for name, table, query in ROW_CHECKS:
+            if not has_table(conn, table):
+                continue
+            ranges = _rowid_ranges(conn, table, chunk_rows)
+            results[name] = {"check": name, "table": table, "violations": 0, "chunks": len(ranges), "seconds": 0.0}
+            jobs += [(name, query, rowid_range) for rowid_range in ranges]
+        for name, query in TABLE_CHECKS:
+            results[name] = {"check": name, "table": None, "violations": 0, "chunks": 1, "seconds": 0.0}
+            jobs.append((name, query, ()))
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for name, count, seconds in pool.map(lambda job: run_chunk(*job), jobs):
+                results[name]["violations"] += count
+                results[name]["seconds"] += seconds
+    finally:
+        connections.close()
+
+    checks = list(results.values())
+    for check in checks:
+        check["seconds"] = round(check["seconds"], 4)
+    return {
+        "db": db_path,
+        "ok": all(check["violations"] == 0 for check in checks),
+        "workers": workers,
+        "chunk_rows": chunk_rows,
+        "seconds": round(time.perf_counter() - start, 3),
+        "checks": checks
+    }
+
+def run_verify(db_path, workers, chunk_rows, json_path=None):
+    summary = verify(db_path, workers, chunk_rows)
+
+    print(format_table(
+        ["Check", "Violations", "Chunks", "Seconds"],
+        [(c["check"], c["violations"], c["chunks"], f"{c['seconds']:.3f}") for c in summary["checks"]]
+    ))
+    print(f"\n{'PASS' if summary['ok'] else 'FAIL'} in {summary['seconds']:.2f}s")
+
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(summary, f, indent=2)
+    return summary["ok"]
+
+def main(db_path=DB_PATH):
+    if not os.path.exists(db_path):
+        print(f"Database file not found at {db_path}")
         return
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(db_path)
     
     print("="*40)
-    print(f"DATABASE INSPECTION: {DB_PATH}")
+    print(f"DATABASE INSPECTION: {db_path}")
     print("="*40)
 
     run_query(conn, """
@@ -34,16 +222,26 @@ def main():
             (SELECT COUNT(*) FROM tasks) as Total_Tasks
     """, "Data Volume Statistics")
 
-    run_query(conn, """
-        SELECT 
-            t.name as Team_Name, 
-            COUNT(tm.user_id) as Member_Count
-        FROM teams t
-        JOIN team_memberships tm ON t.id = tm.team_id
-        GROUP BY t.id
-        ORDER BY Member_Count DESC
-        LIMIT 5
-    """, "Top 5 Largest Teams")
+    # Summary tables from `main.py --analytics` answer these without
+    # scanning memberships or tasks.
+    if has_table(conn, "team_member_counts"):
+        run_query(conn, """
+            SELECT team_name as Team_Name, member_count as Member_Count
+            FROM team_member_counts
+            ORDER BY member_count DESC
+            LIMIT 5
+        """, "Top 5 Largest Teams")
+    else:
+        run_query(conn, """
+            SELECT 
+                t.name as Team_Name, 
+                COUNT(tm.user_id) as Member_Count
+            FROM teams t
+            JOIN team_memberships tm ON t.id = tm.team_id
+            GROUP BY t.id
+            ORDER BY Member_Count DESC
+            LIMIT 5
+        """, "Top 5 Largest Teams")
 
     run_query(conn, """
         SELECT 
@@ -71,7 +269,46 @@ def main():
         GROUP BY is_completed
     """, "Completion Rates")
 
+    if has_table(conn, "project_completion"):
+        run_query(conn, """
+            SELECT
+                COUNT(*) as Projects,
+                ROUND(AVG(completion_rate), 3) as Avg_Completion_Rate,
+                SUM(completion_rate = 1.0) as Fully_Completed
+            FROM project_completion
+        """, "Project Completion (summary)")
+
+    if has_table(conn, "user_workload"):
+        run_query(conn, """
+            SELECT full_name as Employee, open_tasks as Open_Tasks, assigned_tasks as Assigned_Tasks
+            FROM user_workload
+            ORDER BY open_tasks DESC
+            LIMIT 5
+        """, "Heaviest Open Workloads (summary)")
+
+    if has_table(conn, "task_events"):
+        run_query(conn, """
+            SELECT event_type as Event, COUNT(*) as Events, COUNT(DISTINCT task_id) as Tasks
+            FROM task_events
+            GROUP BY event_type
+            ORDER BY Events DESC
+        """, "Task Activity History")
+
     conn.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Inspect or verify a generated database.")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--verify", action="store_true",
+                        help="Run the full integrity suite in parallel read-only connections")
+    parser.add_argument("--workers", type=int, default=VERIFY_WORKERS)
+    parser.add_argument("--chunk-rows", type=int, default=VERIFY_CHUNK_ROWS)
+    parser.add_argument("--json", default=None, help="Write the verification summary to this file")
+    args = parser.parse_args()
+
+    if args.verify:
+        if not os.path.exists(args.db):
+            print(f"Database file not found at {args.db}")
+            sys.exit(2)
+        sys.exit(0 if run_verify(args.db, args.workers, args.chunk_rows, args.json) else 1)
+    main(args.db)
\ No newline at end of file
@@ -0,0 +1,212 @@
+import os
+import queue
+import logging
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import create_engine, inspect, make_url
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import AddConstraint, CreateTable
+from models.database import Base, SECONDARY_INDEXES
+from exporters.stream_export import fill_defaults
+from utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+STORAGE_BACKENDS = ["sqlite", "postgres", "copy-files"]
+COPY_BATCH_ROWS = 50000
+LOADER_WORKERS = 4
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+def copy_value(value):
+    # PostgreSQL COPY text format.
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, bytes):
+        return "\\\\x" + value.hex()
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, str):
+        return value.translate(_COPY_ESCAPES)
+    return str(value)
+
+def encode_copy_rows(columns, rows):
+    return "".join(
+        "\t".join(copy_value(row[name]) for name in columns) + "\n" for row in rows
+    )
+
+def copy_statement(table_name, columns, source="STDIN"):
+    return f"COPY {table_name} ({', '.join(columns)}) FROM {source}"
+
+class PostgresCopyTarget:
+    def __init__(self, url, pool_size=LOADER_WORKERS):
+        try:
+            import psycopg
+        except ImportError:
+            raise RuntimeError("The postgres backend requires psycopg (pip install 'psycopg[binary]')")
+        url = make_url(url)
+        self.engine = create_engine(url.set(drivername="postgresql+psycopg"))
+        dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        self._pool = queue.Queue()
+        for _ in range(pool_size):
+            self._pool.put(psycopg.connect(dsn))
+
+    def prepare(self):
+        Base.metadata.drop_all(self.engine)
+        Base.metadata.create_all(self.engine)
+
+        # Tables load concurrently on separate connections, so foreign keys
+        # are dropped for the load and validated once at the end.
+        inspector = inspect(self.engine)
+        with self.engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                for fk in inspector.get_foreign_keys(table.name):
+                    conn.exec_driver_sql(f"ALTER TABLE {table.name} DROP CONSTRAINT {fk['name']}")
+
+    def copy(self, table_name, columns, payload):
+        conn = self._pool.get()
+        try:
+            with conn.cursor() as cur:
+                with cur.copy(copy_statement(table_name, columns)) as copy:
+                    copy.write(payload)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._pool.put(conn)
+
+    def finish(self):
+        with self.engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                for fk in table.foreign_key_constraints:
+                    conn.execute(AddConstraint(fk))
+            for ddl in SECONDARY_INDEXES:
+                conn.exec_driver_sql(ddl)
+        logger.info(f"Restored foreign keys and indexes on {self.engine.url.render_as_string()}")
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get().close()
+        self.engine.dispose()
+
+class FileCopyTarget:
+    # Writes the exact COPY payloads to <table>.copy files plus a load.sql
+    # that replays them with psql, so the loader runs without a server.
+    def __init__(self, out_dir):
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self._files = {}
+        self._columns = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def prepare(self):
+        pass
+
+    def _open(self, table_name, columns):
+        with self._lock:
+            if table_name not in self._files:
+                path = os.path.join(self.out_dir, f"{table_name}.copy")
+                self._files[table_name] = open(path, "w", encoding="utf-8")
+                self._columns[table_name] = columns
+                self._locks[table_name] = threading.Lock()
+            return self._files[table_name], self._locks[table_name]
+
+    def copy(self, table_name, columns, payload):
+        f, lock = self._open(table_name, columns)
+        with lock:
+            f.write(payload)
+
+    def finish(self):
+        dialect = postgresql.dialect()
+        with open(os.path.join(self.out_dir, "load.sql"), "w", encoding="utf-8") as f:
+            f.write("BEGIN;\n")
+            for table in Base.metadata.sorted_tables:
+                f.write(f"DROP TABLE IF EXISTS {table.name} CASCADE;\n")
+                f.write(str(CreateTable(table, include_foreign_key_constraints=[]).compile(dialect=dialect)).strip())
+                f.write(";\n")
+            for table in Base.metadata.sorted_tables:
+                if table.name in self._columns:
+                    # psql's \copy takes the table directly, not a COPY statement.
+                    columns = ", ".join(self._columns[table.name])
+                    f.write(f"\\copy {table.name} ({columns}) FROM '{table.name}.copy'\n")
+            for table in Base.metadata.sorted_tables:
+                for fk in table.foreign_key_constraints:
+                    f.write(str(AddConstraint(fk).compile(dialect=dialect)).strip() + ";\n")
+            for ddl in SECONDARY_INDEXES:
+                f.write(ddl + ";\n")
+            f.write("COMMIT;\n")
+        logger.info(f"Wrote COPY files and load.sql to {self.out_dir}")
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+class CopyLoader:
+    # Row sink for bulk_insert: buffers each table up to batch_rows, then
+    # hands the batch to a pool of loader threads that COPY tables in parallel.
+    def __init__(self, target, workers=LOADER_WORKERS, batch_rows=COPY_BATCH_ROWS):
+        self.target = target
+        self.batch_rows = batch_rows
+        self.row_counts = {}
+        self._buffers = {}
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="copy-loader")
+        # Bounds the number of encoded batches held in memory at once.
+        self._slots = threading.Semaphore(workers * 2)
+        self._futures = []
+        target.prepare()
+
+    def write(self, table, rows):
+        buffer = self._buffers.setdefault(table, [])
+        buffer.extend(fill_defaults(table, rows))
+        self.row_counts[table.name] = self.row_counts.get(table.name, 0) + len(rows)
+        if len(buffer) >= self.batch_rows:
+            self._submit(table)
+
+    def _submit(self, table):
+        rows = self._buffers.pop(table, None)
+        if not rows:
+            return
+        self._slots.acquire()
+        future = self._pool.submit(self._load, table, rows)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures = [f for f in self._futures if not f.done() or f.exception()]
+        self._futures.append(future)
+
+    def _load(self, table, rows):
+        columns = [c.name for c in table.columns]
+        with METRICS.timer("copy_batch"):
+            self.target.copy(table.name, columns, encode_copy_rows(columns, rows))
+        METRICS.inc("copy_rows", len(rows), table=table.name)
+
+    def flush(self):
+        for table in list(self._buffers):
+            self._submit(table)
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def close(self):
+        try:
+            self.flush()
+            self.target.finish()
+        finally:
+            self._pool.shutdown(wait=True)
+            self.target.close()
+
+def create_copy_loader(backend, database_url=None, copy_dir=None, workers=LOADER_WORKERS,
+                       batch_rows=COPY_BATCH_ROWS):
+    if backend == "postgres":
+        if not database_url:
+            raise ValueError("The postgres backend needs a database URL")
+        target = PostgresCopyTarget(database_url, pool_size=workers)
+    elif backend == "copy-files":
+        target = FileCopyTarget(copy_dir)
+    else:
+        raise ValueError(f"Unknown storage backend '{backend}'. Choose from {STORAGE_BACKENDS}")
+    return CopyLoader(target, workers=workers, batch_rows=batch_rows)
@@ -0,0 +1,194 @@
+import os
+import csv
+import json
+import sqlite3
+import logging
+import argparse
+from datetime import datetime
+from sqlalchemy import Boolean, DateTime, Float, Integer
+from models.database import Base, KeyType, check_key_strategy, detect_key_strategy, get_key_strategy
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ["jsonl", "csv", "parquet"]
+EXPORT_CHUNK_SIZE = 10000
+
+def _arrow_type(pa, column, key_strategy):
+    if isinstance(column.type, KeyType):
+        if key_strategy == "blob":
+            return pa.binary(16)
+        if key_strategy == "integer":
+            return pa.int64()
+        return pa.string()
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    return pa.string()
+
+def _plain(value):
+    # Blob keys are written as hex in text formats.
+    if isinstance(value, bytes):
+        return value.hex()
+    return str(value)
+
+class JsonlWriter:
+    extension = "jsonl"
+
+    def __init__(self, path, table, key_strategy):
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, rows):
+        for row in rows:
+            self._file.write(json.dumps(row, default=_plain))
+            self._file.write("\n")
+
+    def close(self):
+        self._file.close()
+
+class CsvWriter:
+    extension = "csv"
+
+    def __init__(self, path, table, key_strategy):
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=[c.name for c in table.columns])
+        self._writer.writeheader()
+
+    def write(self, rows):
+        self._writer.writerows(
+            {k: v.hex() if isinstance(v, bytes) else v for k, v in row.items()} for row in rows
+        )
+
+    def close(self):
+        self._file.close()
+
+class ParquetWriter:
+    extension = "parquet"
+
+    def __init__(self, path, table, key_strategy):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+        self._pa = pa
+        self._schema = pa.schema([(c.name, _arrow_type(pa, c, key_strategy)) for c in table.columns])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows):
+        if rows:
+            self._writer.write_table(self._pa.Table.from_pylist(rows, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+WRITERS = {"jsonl": JsonlWriter, "csv": CsvWriter, "parquet": ParquetWriter}
+
+class ExportSink:
+    def __init__(self, out_dir, fmt="jsonl", key_strategy=None):
+        if fmt not in WRITERS:
+            raise ValueError(f"Unknown export format '{fmt}'. Choose from {EXPORT_FORMATS}")
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.key_strategy = key_strategy or get_key_strategy()
+        self.row_counts = {}
+        self._writers = {}
+
+    def _writer(self, table):
+        if table.name not in self._writers:
+            writer_cls = WRITERS[self.fmt]
+            path = os.path.join(self.out_dir, f"{table.name}.{writer_cls.extension}")
+            self._writers[table.name] = writer_cls(path, table, self.key_strategy)
+            self.row_counts[table.name] = 0
+        return self._writers[table.name]
+
+    def write(self, table, rows):
+        complete = fill_defaults(table, rows)
+        self._writer(table).write(complete)
+        self.row_counts[table.name] += len(complete)
+
+    def close(self):
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+def fill_defaults(table, rows):
+    # Core inserts fill Python-side column defaults; do the same here so
+    # every chunk of a table has the same shape.
+    columns = list(table.columns)
+    return [
+        {c.name: row[c.name] if c.name in row else _default_value(c) for c in columns}
+        for row in rows
+    ]
+
+def _default_value(column):
+    default = column.default
+    if default is None:
+        return None
+    if default.is_callable:
+        return default.arg(None)
+    return default.arg
+
+def _converters(table):
+    converters = {}
+    for column in table.columns:
+        if isinstance(column.type, DateTime):
+            converters[column.name] = lambda v: datetime.fromisoformat(v) if isinstance(v, str) else v
+        elif isinstance(column.type, Boolean):
+            converters[column.name] = lambda v: bool(v) if v is not None else None
+    return converters
+
+def iter_table_chunks(conn, table, chunk_size=EXPORT_CHUNK_SIZE):
+    names = [c.name for c in table.columns]
+    converters = _converters(table)
+    cursor = conn.execute(f"SELECT {', '.join(names)} FROM {table.name} ORDER BY rowid")
+
+    while True:
+        batch = cursor.fetchmany(chunk_size)
+        if not batch:
+            return
+        rows = [dict(zip(names, values)) for values in batch]
+        for name, convert in converters.items():
+            for row in rows:
+                row[name] = convert(row[name])
+        yield rows
+
+def export_connection(conn, sink, chunk_size=EXPORT_CHUNK_SIZE):
+    for table in Base.metadata.sorted_tables:
+        for rows in iter_table_chunks(conn, table, chunk_size):
+            sink.write(table, rows)
+
+def export_database(db_path, out_dir, fmt="jsonl", chunk_size=EXPORT_CHUNK_SIZE, key_strategy=None):
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    sink = None
+    try:
+        # Typed formats follow the file's own key layout, not this process's.
+        sink = ExportSink(out_dir, fmt, check_key_strategy(detect_key_strategy(conn), key_strategy))
+        export_connection(conn, sink, chunk_size)
+    finally:
+        conn.close()
+        if sink is not None:
+            sink.close()
+
+    logger.info(f"Exported {sum(sink.row_counts.values())} rows to {out_dir} as {fmt}")
+    return sink.row_counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a generated database to flat files.")
+    parser.add_argument("--db", default="output/asana_simulation.sqlite")
+    parser.add_argument("--out", default="output/export")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="jsonl")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
+    for table_name, count in export_database(args.db, args.out, args.format, args.chunk_size).items():
+        print(f"{table_name:<26}{count:>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import heapq
+import random
+import logging
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import exists, literal_column, select
+from sqlalchemy.orm import Session
+from models.database import Project, Section, Task, TaskEvent, TeamMembership
+from utils.bulk import ChunkedWriter, CommitBatcher, DEFAULT_CHUNK_SIZE
+from utils.constants import COMMENT_TEMPLATES
+from utils.distributions import get_reference_time
+from utils.metrics import METRICS
+from utils.seeding import seed_stream
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_CHUNK_TASKS = 20000
+COMMENTS_PER_DAY = 0.1
+REASSIGN_PROB = 0.2
+ACTIVITY_COMMIT_EVERY = 200000
+
+def _event(task_id, event_type, occurred_at, actor_id, section_id, assignee_id, detail=None):
+    return {
+        "task_id": task_id,
+        "event_type": event_type,
+        "occurred_at": occurred_at,
+        "actor_id": actor_id,
+        "section_id": section_id,
+        "assignee_id": assignee_id,
+        "detail": detail
+    }
+
+def task_process(task, sections, members, now, rand, comments_per_day=COMMENTS_PER_DAY,
+                 reassign_prob=REASSIGN_PROB):
+    # Yields one task's events in time order. The history always ends in the
+    # task's stored snapshot: its final section, assignee and completion.
+    task_id, section_id, assignee_id, created_at, completed_at = task
+    path = sections[:sections.index(section_id) + 1] if section_id in sections else [section_id]
+    end = completed_at or now
+    if end <= created_at:
+        end = created_at + timedelta(hours=1)
+
+    assignee = assignee_id
+    reassign_at = None
+    if members and rand.random() < reassign_prob:
+        previous = rand.choice(members)
+        if previous != assignee_id:
+            assignee = previous
+            reassign_at = created_at + (end - created_at) * rand.random()
+
+    yield _event(task_id, "created", created_at, assignee, path[0], assignee)
+
+    index = 0
+    last_move = created_at
+    next_move = None
+    next_comment = None
+    if comments_per_day:
+        next_comment = created_at + timedelta(days=rand.expovariate(comments_per_day))
+
+    while True:
+        if next_move is None and index < len(path) - 1:
+            # The next of the remaining moves, as the minimum of that many
+            # uniform times before the end.
+            remaining = len(path) - 1 - index
+            next_move = last_move + (end - last_move) * (1 - rand.random() ** (1 / remaining))
+
+        candidates = [t for t in (next_move, reassign_at, next_comment) if t is not None and t < end]
+        if not candidates:
+            break
+        at = min(candidates)
+
+        if at == next_move:
+            index += 1
+            last_move = at
+            next_move = None
+            yield _event(task_id, "moved", at, assignee, path[index], assignee)
+        elif at == reassign_at:
+            actor = assignee
+            assignee = assignee_id
+            reassign_at = None
+            yield _event(task_id, "reassigned", at, actor, path[index], assignee)
+        else:
+            actor = assignee or (rand.choice(members) if members else None)
+            next_comment = at + timedelta(days=rand.expovariate(comments_per_day))
+            yield _event(task_id, "commented", at, actor, path[index], assignee, rand.choice(COMMENT_TEMPLATES))
+
+    if completed_at:
+        # end is completed_at unless that was bumped past created_at; either
+        # way the completion stays the last event in time.
+        yield _event(task_id, "completed", end, assignee, path[index], assignee)
+
+def task_random(activity_seed, task_id):
+    # One stream per task: the scheduler interleaves processes, so a shared
+    # stream would make a history depend on the other tasks in its chunk.
+    return random.Random(f"{activity_seed}:{task_id}")
+
+def run_schedule(processes):
+    # Discrete-event scheduler: the heap holds only each process's next
+    # event, so memory is bounded by the number of live processes.
+    heap = []
+    for seq, process in enumerate(processes):
+        event = next(process, None)
+        if event is not None:
+            heap.append((event["occurred_at"], seq, event, process))
+    heapq.heapify(heap)
+
+    while heap:
+        _, seq, event, process = heap[0]
+        yield event
+        following = next(process, None)
+        if following is None:
+            heapq.heappop(heap)
+        else:
+            heapq.heapreplace(heap, (following["occurred_at"], seq, following, process))
+
+def _load_context(session):
+    sections = {}
+    for project_id, section_id in session.execute(
+        select(Section.project_id, Section.id).order_by(Section.project_id, Section.rank)
+    ):
+        sections.setdefault(project_id, []).append(section_id)
+
+    members = {}
+    for team_id, user_id in session.execute(select(TeamMembership.team_id, TeamMembership.user_id)):
+        members.setdefault(team_id, []).append(user_id)
+
+    project_members = {
+        project_id: members.get(team_id, [])
+        for project_id, team_id in session.execute(select(Project.id, Project.team_id))
+    }
+    return sections, project_members
+
+def _iter_task_chunks(session, chunk_tasks, only_missing=False):
+    # Keyset pagination on rowid; each chunk is fully read before any of its
+    # events are written, so reads and writes share one connection.
+    rowid = literal_column("tasks.rowid")
+    query = select(
+        rowid, Task.project_id, Task.id, Task.section_id, Task.assignee_id, Task.created_at, Task.completed_at
+    ).order_by(rowid).limit(chunk_tasks)
+    if only_missing:
+        query = query.where(~exists().where(TaskEvent.task_id == Task.id))
+
+    after = 0
+    while True:
+        rows = session.execute(query.where(rowid > after)).all()
+        if not rows:
+            return
+        after = rows[-1][0]
+        yield rows
+
+@METRICS.timed("simulate_activity")
+def simulate_activity(session: Session, seed=None, now=None, only_missing=False, chunk_tasks=ACTIVITY_CHUNK_TASKS,
+                      chunk_size=DEFAULT_CHUNK_SIZE, commit_every=ACTIVITY_COMMIT_EVERY,
+                      comments_per_day=COMMENTS_PER_DAY, reassign_prob=REASSIGN_PROB):
+    rng = seed_stream(seed, "activity")
+    activity_seed = int(rng.integers(2**32))
+    if now is None:
+        now = get_reference_time() or datetime.now(timezone.utc)
+    now = now.replace(tzinfo=None)
+
+    sections, project_members = _load_context(session)
+    writer = ChunkedWriter(session, chunk_size)
+    batcher = CommitBatcher(session, commit_every, writer=writer)
+    table = TaskEvent.__table__
+
+    total_tasks = 0
+    total_events = 0
+    for rows in _iter_task_chunks(session, chunk_tasks, only_missing):
+        processes = (
+            task_process(
+                row[2:], sections.get(row[1], []), project_members.get(row[1], []), now,
+                task_random(activity_seed, row[2]), comments_per_day=comments_per_day, reassign_prob=reassign_prob
+            )
+            for row in rows
+        )
+        events = 0
+        for event in run_schedule(processes):
+            writer.add(table, event)
+            events += 1
+
+        total_tasks += len(rows)
+        total_events += events
+        batcher.add(events)
+
+    batcher.commit()
+    logger.info(f"Simulated {total_events} events for {total_tasks} tasks")
+    return total_events
@@ -0,0 +1,98 @@
+import numpy as np
+
+ZIPF_EXPONENT = 1.1
+UNASSIGNED_RATE = 0.15
+# Leads spend part of their time reviewing, so they own fewer tasks.
+ROLE_WEIGHTS = {"admin": 0.5, "member": 1.0}
+
+def build_alias_table(weights):
+    # Vose's alias method: O(n) to build, O(1) per draw.
+    weights = np.asarray(weights, dtype=float)
+    n = len(weights)
+    scaled = weights * n / weights.sum()
+    prob = np.ones(n)
+    alias = np.arange(n)
+
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] += scaled[s] - 1.0
+        (small if scaled[l] < 1.0 else large).append(l)
+
+    return prob, alias
+
+def alias_draw(prob, alias, size, rng):
+    columns = rng.integers(0, len(prob), size)
+    return np.where(rng.random(size) < prob[columns], columns, alias[columns])
+
+class AssigneeSampler:
+    def __init__(self, user_ids, roles=None, rng=None, zipf_exponent=ZIPF_EXPONENT,
+                 role_weights=ROLE_WEIGHTS, unassigned_rate=UNASSIGNED_RATE, open_task_cap=None):
+        rng = rng if rng is not None else np.random.default_rng()
+        self.user_ids = list(user_ids)
+        self.unassigned_rate = unassigned_rate
+        self.open_task_cap = open_task_cap
+        self.open_counts = np.zeros(len(self.user_ids), dtype=np.int64)
+
+        if not self.user_ids:
+            self.weights = np.zeros(0)
+            return
+
+        # A random Zipf rank per member, so every team has its own busiest people.
+        ranks = rng.permutation(len(self.user_ids)) + 1
+        self.weights = ranks.astype(float) ** -zipf_exponent
+        if roles is not None:
+            self.weights *= np.array([role_weights.get(role, 1.0) for role in roles])
+        self._prob, self._alias = build_alias_table(self.weights)
+
+    @classmethod
+    def from_roster(cls, roster, rng=None, **kwargs):
+        # roster: [(user_id, membership_role), ...]
+        user_ids = [user_id for user_id, _ in roster]
+        roles = [role for _, role in roster]
+        return cls(user_ids, roles, rng=rng, **kwargs)
+
+    def draw(self, size, rng, is_open=None):
+        if not self.user_ids:
+            return [None] * size
+
+        picks = alias_draw(self._prob, self._alias, size, rng)
+        assigned = rng.random(size) >= self.unassigned_rate
+
+        if self.open_task_cap is not None:
+            is_open = np.ones(size, dtype=bool) if is_open is None else np.asarray(is_open, dtype=bool)
+            assigned = self._apply_open_cap(picks, assigned & is_open, rng) | (assigned & ~is_open)
+
+        return [self.user_ids[i] if a else None for i, a in zip(picks.tolist(), assigned.tolist())]
+
+    def _apply_open_cap(self, picks, open_draws, rng):
+        # Draws past a user's cap are re-drawn from the members who still have
+        # room; once nobody does, the remaining open tasks stay unassigned.
+        kept = np.zeros(len(picks), dtype=bool)
+        pending = np.flatnonzero(open_draws)
+
+        while len(pending):
+            users = picks[pending]
+            order = np.argsort(users, kind="stable")
+            sorted_users = users[order]
+            group_start = np.flatnonzero(np.r_[True, sorted_users[1:] != sorted_users[:-1]])
+            group_sizes = np.diff(np.r_[group_start, len(sorted_users)])
+            seen = np.empty(len(users), dtype=np.int64)
+            seen[order] = np.arange(len(users)) - np.repeat(group_start, group_sizes)
+
+            fits = self.open_counts[users] + seen < self.open_task_cap
+            kept[pending[fits]] = True
+            np.add.at(self.open_counts, users[fits], 1)
+
+            pending = pending[~fits]
+            room = self.open_counts < self.open_task_cap
+            if not len(pending) or not room.any():
+                break
+            prob, alias = build_alias_table(self.weights * room)
+            picks[pending] = alias_draw(prob, alias, len(pending), rng)
+
+        return kept
@@ -0,0 +1,58 @@
+from collections import namedtuple
+from utils.constants import DEPARTMENT_ROLES, PROJECT_TEMPLATES
+
+DEFAULT_DEPARTMENT = "Operations"
+
+# Everything generation needs about a department, resolved once at import
+# instead of scanning the template dicts for every team, user and project.
+DepartmentBlueprint = namedtuple(
+    "DepartmentBlueprint", ["name", "roles", "lead_role", "project_titles", "sections"]
+)
+
+def compile_blueprints(roles=DEPARTMENT_ROLES, templates=PROJECT_TEMPLATES):
+    blueprints = {}
+    for name in roles.keys() | templates.keys():
+        template = templates.get(name, templates[DEFAULT_DEPARTMENT])
+        blueprints[name] = DepartmentBlueprint(
+            name=name,
+            roles=tuple(roles.get(name, ["Member"])),
+            lead_role=f"{name} Lead",
+            project_titles=tuple(template["titles"]),
+            sections=tuple(template["sections"])
+        )
+    return blueprints
+
+BLUEPRINTS = compile_blueprints()
+DEPARTMENTS = list(DEPARTMENT_ROLES.keys())
+
+def get_blueprint(department):
+    return BLUEPRINTS.get(department) or BLUEPRINTS[DEFAULT_DEPARTMENT]
+
+def plan_departments(num_teams, mix=None):
+    # Without a mix, departments take turns; with one, each gets its
+    # largest-remainder share of teams, still interleaved.
+    if not mix:
+        return [DEPARTMENTS[i % len(DEPARTMENTS)] for i in range(num_teams)]
+    if not isinstance(mix, dict):
+        mix = {department: 1 for department in mix}
+
+    unknown = set(mix) - set(BLUEPRINTS)
+    if unknown:
+        raise ValueError(f"Unknown department(s): {sorted(unknown)}. Choose from {sorted(BLUEPRINTS)}")
+
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("Department mix needs at least one positive weight")
+    quotas = {department: num_teams * weight / total for department, weight in mix.items()}
+    counts = {department: int(quota) for department, quota in quotas.items()}
+    shortfall = num_teams - sum(counts.values())
+    for department in sorted(mix, key=lambda d: quotas[d] - counts[d], reverse=True)[:shortfall]:
+        counts[department] += 1
+
+    plan = []
+    while len(plan) < num_teams:
+        for department in mix:
+            if counts[department]:
+                plan.append(department)
+                counts[department] -= 1
+    return plan
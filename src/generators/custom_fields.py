@@ -0,0 +1,94 @@
+import json
+import logging
+import numpy as np
+from collections import namedtuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from models.database import CustomFieldDefinition, generate_uuid
+from utils.bulk import bulk_insert, DEFAULT_CHUNK_SIZE
+from utils.constants import CUSTOM_FIELD_TEMPLATES
+
+logger = logging.getLogger(__name__)
+
+CustomFieldRecord = namedtuple("CustomFieldRecord", ["id", "name", "field_type", "spec"])
+
+def _options(spec):
+    return json.dumps(spec["options"]) if spec["field_type"] == "enum" else None
+
+def create_custom_field_definitions(session: Session, org_id, count=len(CUSTOM_FIELD_TEMPLATES),
+                                    chunk_size=DEFAULT_CHUNK_SIZE):
+    fields = [
+        CustomFieldRecord(id=generate_uuid(), name=spec["name"], field_type=spec["field_type"], spec=spec)
+        for spec in CUSTOM_FIELD_TEMPLATES[:count]
+    ]
+    bulk_insert(session, CustomFieldDefinition.__table__, [
+        {
+            "id": field.id,
+            "org_id": org_id,
+            "name": field.name,
+            "field_type": field.field_type,
+            "enum_options": _options(field.spec)
+        }
+        for field in fields
+    ], chunk_size)
+
+    logger.info(f"Created {len(fields)} custom field definitions")
+    return fields
+
+def load_custom_field_definitions(session: Session, org_id):
+    templates = {spec["name"]: spec for spec in CUSTOM_FIELD_TEMPLATES}
+    rows = session.execute(
+        select(CustomFieldDefinition.id, CustomFieldDefinition.name, CustomFieldDefinition.field_type)
+        .where(CustomFieldDefinition.org_id == org_id)
+    )
+    return [
+        CustomFieldRecord(id=field_id, name=name, field_type=field_type, spec=templates[name])
+        for field_id, name, field_type in rows if name in templates
+    ]
+
+def _draw_values(spec, size, rng):
+    if spec["field_type"] == "enum":
+        picks = rng.choice(len(spec["options"]), size, p=spec.get("weights"))
+        return np.array(spec["options"], dtype=object)[picks], None
+
+    if spec["field_type"] == "number":
+        if "choices" in spec:
+            numbers = rng.choice(np.array(spec["choices"], dtype=float), size, p=spec.get("weights"))
+        else:
+            mean, sigma = spec["lognormal"]
+            numbers = np.round(rng.lognormal(mean, sigma, size), 2)
+        return None, numbers
+
+    if "values" in spec:
+        picks = rng.integers(0, len(spec["values"]), size)
+        return np.array(spec["values"], dtype=object)[picks], None
+
+    low, high = spec["range"]
+    return np.array([spec["pattern"].format(n) for n in rng.integers(low, high, size).tolist()], dtype=object), None
+
+def build_custom_field_rows(fields, task_ids, rng):
+    task_ids = np.asarray(task_ids, dtype=object)
+    rows = []
+
+    for field in fields:
+        # One draw per field for the whole batch: which tasks have the field
+        # set, then every value at once.
+        filled = task_ids[rng.random(len(task_ids)) < field.spec["fill_rate"]]
+        if not len(filled):
+            continue
+
+        texts, numbers = _draw_values(field.spec, len(filled), rng)
+        texts = texts.tolist() if texts is not None else [None] * len(filled)
+        numbers = numbers.tolist() if numbers is not None else [None] * len(filled)
+
+        rows.extend(
+            {
+                "id": generate_uuid(),
+                "task_id": task_id,
+                "field_definition_id": field.id,
+                "value_text": text,
+                "value_number": number
+            }
+            for task_id, text, number in zip(filled.tolist(), texts, numbers)
+        )
+    return rows
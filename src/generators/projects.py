@@ -1,42 +1,56 @@
 import random
 import logging
+from collections import namedtuple
 from sqlalchemy.orm import Session
-from models.database import Project,Section,Team
-from utils.constants import PROJECT_TEMPLATES
+from models.database import Project, Section, Team, generate_uuid
+from generators.blueprints import get_blueprint
+from utils.bulk import ChunkedWriter, DEFAULT_CHUNK_SIZE
+from utils.metrics import METRICS
 
 logger = logging.getLogger(__name__)
 
-def create_projects_for_team(session:Session, team:Team, num_projects=3):
-    dept_name = "Operations" #default
-    for key in PROJECT_TEMPLATES.keys():
-        if key in team.name:
-            dept_name = key
-            break
+# Lightweight stand-ins for the ORM objects, carrying just what task
+# generation needs.
+ProjectRecord = namedtuple("ProjectRecord", ["id", "team_id", "name", "status", "sections"])
+SectionRecord = namedtuple("SectionRecord", ["id", "project_id", "name", "rank"])
 
-    template = PROJECT_TEMPLATES.get(dept_name)
-
-    created_projects = []
+def iter_project_records(team: Team, num_projects=3):
+    blueprint = get_blueprint(team.department)
 
     for _ in range(num_projects):
-        project_name = random.choice(template["titles"])
-        new_project = Project(
-            team_id = team.id,
-            name = project_name,
-            status=random.choice(["On Track", "At Risk", "Off Track"])
+        project_id = generate_uuid()
+        sections = [
+            SectionRecord(id=generate_uuid(), project_id=project_id, name=section_name, rank=index)
+            for index, section_name in enumerate(blueprint.sections)
+        ]
+        yield ProjectRecord(
+            id=project_id,
+            team_id=team.id,
+            name=random.choice(blueprint.project_titles),
+            status=random.choice(["On Track", "At Risk", "Off Track"]),
+            sections=sections
         )
 
-        session.add(new_project)
-        session.flush()
+@METRICS.timed("create_projects_for_team")
+def create_projects_for_team(session: Session, team: Team, num_projects=3, writer=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    own_writer = writer is None
+    if own_writer:
+        writer = ChunkedWriter(session, chunk_size)
+
+    created_projects = []
+
+    for project in iter_project_records(team, num_projects):
+        writer.add(Project.__table__, {
+            "id": project.id,
+            "team_id": project.team_id,
+            "name": project.name,
+            "status": project.status
+        })
+        writer.extend(Section.__table__, (section._asdict() for section in project.sections))
+        created_projects.append(project)
 
-        for index,section_name in enumerate(template["sections"]):
-            new_section = Section(
-                project_id = new_project.id,
-                name = section_name,
-                rank = index
-            )
-            session.add(new_section)
-        
-        created_projects.append(new_project)
+    if own_writer:
+        writer.flush()
 
-    logger.info(f"Created {len(created_projects)} projects for {team.name}")
+    logger.debug(f"Created {len(created_projects)} projects for {team.name}")
     return created_projects
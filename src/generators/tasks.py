@@ -1,79 +1,96 @@
 import random
 import logging
-from datetime import datetime, timedelta, timezone
+import numpy as np
 from sqlalchemy.orm import Session
-from models.database import Task, Project, Section
-from utils.distributions import get_realistic_task_duration
-from utils.llm_client import generate_task_content 
+from models.database import Task, CustomFieldValue, generate_uuid
+from generators.assignees import AssigneeSampler
+from generators.blueprints import BLUEPRINTS
+from generators.custom_fields import build_custom_field_rows
+from generators.projects import ProjectRecord
+from utils.bulk import bulk_insert, DEFAULT_CHUNK_SIZE
+from utils.distributions import generate_task_timeline
+from utils.llm_client import generate_task_content_batch
+from utils.metrics import METRICS
 
 logger = logging.getLogger(__name__)
 
-def create_tasks_for_project(session: Session, project: Project, users: list):
+CONTENT_DEPT = "General"
+
+def content_keys():
+    return sorted({
+        (CONTENT_DEPT, section_name)
+        for blueprint in BLUEPRINTS.values()
+        for section_name in blueprint.sections
+    })
+
+def section_completion_prob(section_name, index, total_sections):
+    progress_ratio = (index + 1) / total_sections
+    completion_prob = progress_ratio ** 2  
+    
+    name_lower = section_name.lower()
+    if any(x in name_lower for x in ['done', 'complete', 'shipped', 'released']):
+        completion_prob = 0.98
+    elif any(x in name_lower for x in ['backlog', 'todo', 'idea']):
+        completion_prob = 0.05
+    return completion_prob
+
+def build_task_columns(project_id, section_ids, contents, completion_probs, sampler, rng=None):
+    rng = rng if rng is not None else np.random.default_rng()
+    size = len(contents)
+
+    columns = generate_task_timeline(completion_probs, rng=rng)
+    columns["id"] = [generate_uuid() for _ in range(size)]
+    columns["project_id"] = [project_id] * size
+    columns["section_id"] = list(section_ids)
+    columns["name"] = [c['title'] for c in contents]
+    columns["description"] = [c['description'] for c in contents]
+    columns["assignee_id"] = sampler.draw(size, rng, is_open=[not done for done in columns["is_completed"]])
+    return columns
+
+def columns_to_rows(columns):
+    keys = list(columns.keys())
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+@METRICS.timed("create_tasks_for_project")
+def create_tasks_for_project(session: Session, project: ProjectRecord, user_ids: list, chunk_size=DEFAULT_CHUNK_SIZE,
+                             content_source=None, rng=None, writer=None, custom_fields=None, sampler=None):
     sections = sorted(project.sections, key=lambda s: s.rank)
     total_sections = len(sections)
     
     if not total_sections:
         return []
 
-    tasks_created = []
-
-    for index, section in enumerate(sections):
-        progress_ratio = (index + 1) / total_sections
-        completion_prob = progress_ratio ** 2  
-        
-        name_lower = section.name.lower()
-        if any(x in name_lower for x in ['done', 'complete', 'shipped', 'released']):
-            completion_prob = 0.98
-        elif any(x in name_lower for x in ['backlog', 'todo', 'idea']):
-            completion_prob = 0.05
-
-        num_tasks = random.randint(3, 8)
-        
-        task_contents = generate_task_content(
-            dept="General",
-            section_name=section.name, 
-            count=num_tasks
-        )
-
-        for content in task_contents:
-            days_ago = random.randint(1, 90)
-            created_at = datetime.now(timezone.utc) - timedelta(days=days_ago)
-            
-            duration_days = get_realistic_task_duration()
-            due_date = created_at + timedelta(days=duration_days)
+    requests = [(CONTENT_DEPT, section.name, random.randint(3, 8)) for section in sections]
+    with METRICS.timer("generate_task_content"):
+        if content_source is not None:
+            section_contents = content_source.generate_many(requests)
+        else:
+            section_contents = generate_task_content_batch(requests)
 
-            is_completed = random.random() < completion_prob
-            completed_at = None
+    section_ids = []
+    contents = []
+    completion_probs = []
 
-            if is_completed:
-                variance_days = random.uniform(-2, 5)
-                completion_time = due_date + timedelta(days=variance_days)
-                
-                if completion_time < created_at:
-                    completion_time = created_at + timedelta(hours=random.randint(1, 24))
-                
-                if completion_time > datetime.now(timezone.utc):
-                    completion_time = datetime.now(timezone.utc) - timedelta(minutes=random.randint(10, 1000))
+    for index, (section, task_contents) in enumerate(zip(sections, section_contents)):
+        completion_prob = section_completion_prob(section.name, index, total_sections)
 
-                completed_at = completion_time
+        contents.extend(task_contents)
+        section_ids.extend([section.id] * len(task_contents))
+        completion_probs.extend([completion_prob] * len(task_contents))
 
-            assignee = random.choice(users) if users and random.random() > 0.15 else None
+    rng = rng if rng is not None else np.random.default_rng()
+    if sampler is None:
+        sampler = AssigneeSampler(user_ids, rng=rng)
+    columns = build_task_columns(project.id, section_ids, contents, completion_probs, sampler, rng=rng)
+    tasks_created = columns_to_rows(columns)
+    field_values = build_custom_field_rows(custom_fields, columns["id"], rng) if custom_fields else []
 
-            new_task = Task(
-                project_id=project.id,
-                section_id=section.id,
-                name=content['title'],
-                description=content['description'],
-                priority=random.choice(["Low", "Medium", "High"]),
-                assignee_id=assignee.id if assignee else None,
-                created_at=created_at,
-                due_date=due_date,
-                is_completed=is_completed,
-                completed_at=completed_at
-            )
-            
-            session.add(new_task)
-            tasks_created.append(new_task)
+    if writer is not None:
+        writer.extend(Task.__table__, tasks_created)
+        writer.extend(CustomFieldValue.__table__, field_values)
+    else:
+        bulk_insert(session, Task.__table__, tasks_created, chunk_size)
+        bulk_insert(session, CustomFieldValue.__table__, field_values, chunk_size)
 
     logger.info(f" Generated {len(tasks_created)} tasks for project '{project.name}'")
-    return tasks_created
\ No newline at end of file
+    return tasks_created
@@ -1,65 +1,129 @@
+import re
 import random
 import logging
-from faker import Faker
+import numpy as np
+from faker.providers.person.en_US import Provider as PersonProvider
+from sqlalchemy import select, text
 from sqlalchemy.orm import Session
-from models.database import User, Team, TeamMembership
-from utils.constants import DEPARTMENT_ROLES
+from models.database import User, TeamMembership, generate_uuid
+from utils.bulk import ChunkedWriter, DEFAULT_CHUNK_SIZE
+from utils.metrics import METRICS
+from generators.blueprints import get_blueprint
 
-fake = Faker()
 logger = logging.getLogger(__name__)
 
-def generate_users(session: Session, org_id: str, teams: list, count: int):
-    logger.info(f"Generating {count} user profiles...")
-    
-    users = []
-    generated_emails = set()
-    
+IDENTITY_BATCH_SIZE = 10000
+
+def _load_names(names):
+    # Faker ships either a plain tuple or a name -> frequency mapping.
+    if isinstance(names, dict):
+        weights = np.array(list(names.values()), dtype=float)
+        return list(names.keys()), weights / weights.sum()
+    return list(names), None
+
+def _slug(name):
+    return re.sub(r"[^a-z]", "", name.lower()) or "user"
+
+class IdentityAllocator:
+    def __init__(self, domain="example.com", rng=None, batch_size=IDENTITY_BATCH_SIZE):
+        self.domain = domain
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.batch_size = batch_size
+
+        self.first_names, self._first_p = _load_names(PersonProvider.first_names)
+        self.last_names, self._last_p = _load_names(PersonProvider.last_names)
+        self._first_slugs = [_slug(n) for n in self.first_names]
+        self._last_slugs = [_slug(n) for n in self.last_names]
+        self._email_counts = {}
+
+    def _email(self, first_index, last_index):
+        # Local parts are letters-only, so numbered duplicates ("jane.doe2")
+        # can never collide with another person's first choice.
+        base = f"{self._first_slugs[first_index]}.{self._last_slugs[last_index]}"
+        n = self._email_counts.get(base, 0) + 1
+        self._email_counts[base] = n
+        local = base if n == 1 else f"{base}{n}"
+        return f"{local}@{self.domain}"
+
+    def iter_identities(self, count):
+        for start in range(0, count, self.batch_size):
+            size = min(self.batch_size, count - start)
+            firsts = self.rng.choice(len(self.first_names), size, p=self._first_p).tolist()
+            lasts = self.rng.choice(len(self.last_names), size, p=self._last_p).tolist()
+
+            for first_index, last_index in zip(firsts, lasts):
+                full_name = f"{self.first_names[first_index]} {self.last_names[last_index]}"
+                yield full_name, self._email(first_index, last_index)
+
+def iter_user_rows(org_id: str, teams: list, count: int, domain="example.com", rng=None):
+    identities = IdentityAllocator(domain, rng=rng)
     team_has_admin = {team.id: False for team in teams}
     
-    for _ in range(count):
-        profile = fake.simple_profile()
-        email = profile['mail']
-        
-        while email in generated_emails:
-            username = profile['username']
-            email = f"{username}{random.randint(100, 999)}@example.com"
-        
-        generated_emails.add(email)
-        
-        user = User(
-            org_id=org_id,
-            full_name=profile['name'],
-            email=email,
-            is_active=True,
-            role="Member"
-        )
-        
-        session.add(user)
-        session.flush() 
+    for full_name, email in identities.iter_identities(count):
+        user_id = generate_uuid()
+        role = "Member"
+        membership_row = None
         
         if teams:
             team = random.choice(teams)
             
-            dept_key = next((k for k in DEPARTMENT_ROLES.keys() if k in team.name), "Operations")
-            possible_roles = DEPARTMENT_ROLES.get(dept_key, ["Member"])
-            user.role = random.choice(possible_roles)
+            blueprint = get_blueprint(team.department)
+            role = random.choice(blueprint.roles)
 
             if not team_has_admin[team.id]:
                 role_in_team = "admin"
                 team_has_admin[team.id] = True
-                user.role = f"{dept_key} Lead" 
+                role = blueprint.lead_role
             else:
                 role_in_team = "member"
             
-            membership = TeamMembership(
-                user_id=user.id,
-                team_id=team.id,
-                role=role_in_team
-            )
-            session.add(membership)
+            membership_row = {
+                "id": generate_uuid(),
+                "user_id": user_id,
+                "team_id": team.id,
+                "role": role_in_team
+            }
         
-        users.append(user)
+        user_row = {
+            "id": user_id,
+            "org_id": org_id,
+            "full_name": full_name,
+            "email": email,
+            "is_active": True,
+            "role": role
+        }
+        yield user_row, membership_row
+
+@METRICS.timed("generate_users")
+def generate_users(session: Session, org_id: str, teams: list, count: int, chunk_size=DEFAULT_CHUNK_SIZE,
+                   domain="example.com", rng=None):
+    logger.info(f"Generating {count} user profiles...")
+    
+    # Rows go straight to the chunked writer; only the IDs needed for
+    # foreign keys stay resident.
+    writer = ChunkedWriter(session, chunk_size)
+    user_ids = []
+    team_roster = {team.id: [] for team in teams}
+    
+    for user_row, membership_row in iter_user_rows(org_id, teams, count, domain=domain, rng=rng):
+        writer.add(User.__table__, user_row)
+        user_ids.append(user_row["id"])
+        
+        if membership_row is not None:
+            writer.add(TeamMembership.__table__, membership_row)
+            team_roster[membership_row["team_id"]].append((user_row["id"], membership_row["role"]))
         
-    session.flush()
-    logger.info(f"Created {len(users)} users with unique emails.")
-    return users
\ No newline at end of file
+    writer.flush()
+    logger.info(f"Created {len(user_ids)} users with unique emails.")
+    return user_ids, team_roster
+
+def load_team_roster(session: Session, teams: list):
+    user_ids = list(session.execute(select(User.id).order_by(text("rowid"))).scalars())
+    team_roster = {team.id: [] for team in teams}
+
+    rows = session.execute(
+        select(TeamMembership.team_id, TeamMembership.user_id, TeamMembership.role).order_by(text("rowid"))
+    )
+    for team_id, user_id, role in rows:
+        team_roster.setdefault(team_id, []).append((user_id, role))
+    return user_ids, team_roster
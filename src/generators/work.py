@@ -0,0 +1,168 @@
+import os
+import random
+import logging
+from contextlib import contextmanager
+from sqlalchemy import Integer, delete, func, select, text
+from sqlalchemy.orm import sessionmaker
+from models.database import (
+    Base, Team, Project, Section, Task, TaskEvent, CustomFieldValue, get_key_strategy, set_key_strategy
+)
+from generators.assignees import AssigneeSampler
+from generators.projects import create_projects_for_team
+from generators.tasks import create_tasks_for_project
+from utils.bulk import ChunkedWriter, DEFAULT_CHUNK_SIZE
+from utils.distributions import set_reference_time
+from utils.llm_client import REQUESTS_PER_SECOND, set_cache_read_only, set_rate_limit
+from utils.metrics import METRICS, StatementCounter
+from utils.seeding import seed_stream
+from utils.sqlite_tuning import create_tuned_engine
+
+logger = logging.getLogger(__name__)
+
+SHARD_TABLES = ["projects", "sections", "tasks", "custom_field_values"]
+
+def generate_team_work(session, team, team_members, chunk_size=DEFAULT_CHUNK_SIZE, content_source=None, rng=None,
+                       report=None, writer=None, custom_fields=None, open_task_cap=None):
+    span = report.stage if report is not None else _no_report
+    # One sampler per team, so skew and open-task caps span all its projects.
+    sampler = AssigneeSampler.from_roster(team_members, rng=rng, open_task_cap=open_task_cap)
+
+    with span("projects", quiet=True) as stage:
+        projects = create_projects_for_team(
+            session, team, num_projects=random.randint(1, 4), writer=writer, chunk_size=chunk_size
+        )
+        stage["rows"] = len(projects)
+
+    num_tasks = 0
+    with span("tasks", quiet=True) as stage:
+        for proj in projects:
+            tasks = create_tasks_for_project(
+                session, proj, sampler.user_ids,
+                chunk_size=chunk_size, content_source=content_source, rng=rng, writer=writer,
+                custom_fields=custom_fields, sampler=sampler
+            )
+            num_tasks += len(tasks)
+        stage["rows"] = num_tasks
+
+    return len(projects), num_tasks
+
+@contextmanager
+def _no_report(name, quiet=False):
+    yield {"rows": 0}
+
+def run_team_work(session, team, team_roster, all_users, seed=None, generation=0, **kwargs):
+    # Every team draws from its own substream, so a team can be regenerated
+    # or appended to without replaying the rest of the organization.
+    rng = seed_stream(seed, "team", team.name, generation)
+
+    team_members = team_roster.get(team.id)
+    if not team_members:
+        team_members = [(user_id, "member") for user_id in random.sample(all_users, min(3, len(all_users)))]
+
+    return generate_team_work(session, team, team_members, rng=rng, **kwargs)
+
+def teams_with_work(session):
+    return set(session.execute(select(Project.team_id).distinct()).scalars())
+
+def count_team_projects(session, team_id):
+    return session.execute(
+        select(func.count()).select_from(Project).where(Project.team_id == team_id)
+    ).scalar_one()
+
+def delete_team_work(session, team_id):
+    project_ids = select(Project.id).where(Project.team_id == team_id)
+    task_ids = select(Task.id).where(Task.project_id.in_(project_ids))
+    session.execute(delete(TaskEvent).where(TaskEvent.task_id.in_(task_ids)))
+    session.execute(delete(CustomFieldValue).where(CustomFieldValue.task_id.in_(task_ids)))
+    session.execute(delete(Task).where(Task.project_id.in_(project_ids)))
+    session.execute(delete(Section).where(Section.project_id.in_(project_ids)))
+    session.execute(delete(Project).where(Project.team_id == team_id))
+
+def shard_teams(teams, workers):
+    return [teams[i::workers] for i in range(workers) if teams[i::workers]]
+
+def generate_shard(spec):
+    # Integer keys start above everything already in the target database.
+    set_key_strategy(spec["key_strategy"], shard=spec["index"] + 1, base=spec["id_base"])
+    set_reference_time(spec["reference_time"])
+    set_rate_limit(spec["requests_per_second"])
+    set_cache_read_only()
+    # Pool processes can be reused; report only this shard's metrics.
+    METRICS.reset()
+
+    engine = create_tuned_engine(f"sqlite:///{spec['db_path']}", spec["pragmas"])
+    StatementCounter().attach(engine)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    writer = ChunkedWriter(session, spec["chunk_size"])
+
+    total_projects = 0
+    total_tasks = 0
+    try:
+        for team_id, team_name, department in spec["teams"]:
+            team = Team(id=team_id, name=team_name, department=department)
+            num_projects, num_tasks = run_team_work(
+                session, team, spec["roster"], spec["all_users"],
+                seed=spec["seed"], chunk_size=spec["chunk_size"], writer=writer,
+                custom_fields=spec["custom_fields"], open_task_cap=spec["open_task_cap"]
+            )
+            total_projects += num_projects
+            total_tasks += num_tasks
+
+        writer.flush()
+        session.commit()
+    finally:
+        session.close()
+        engine.dispose()
+
+    return spec["db_path"], total_projects, total_tasks, METRICS.snapshot()
+
+def build_shard_specs(teams, team_roster, all_users, workers, shard_dir, seed=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                      pragmas=None, reference_time=None, custom_fields=None, open_task_cap=None, id_base=0,
+                      requests_per_second=REQUESTS_PER_SECOND):
+    os.makedirs(shard_dir, exist_ok=True)
+    shards = shard_teams([(team.id, team.name, team.department) for team in teams], workers)
+
+    specs = []
+    for index, shard in enumerate(shards):
+        specs.append({
+            "index": index,
+            "db_path": os.path.join(shard_dir, f"shard_{index}.sqlite"),
+            "key_strategy": get_key_strategy(),
+            "id_base": id_base,
+            "teams": shard,
+            "roster": {team_id: team_roster.get(team_id, []) for team_id, _, _ in shard},
+            "all_users": all_users,
+            "seed": seed,
+            "reference_time": reference_time,
+            # Every shard runs at once, so they split the LLM rate limit.
+            "requests_per_second": requests_per_second / len(shards),
+            "custom_fields": custom_fields or [],
+            "open_task_cap": open_task_cap,
+            "chunk_size": chunk_size,
+            "pragmas": pragmas or {}
+        })
+    return specs
+
+def merge_shards(engine, shard_paths, tables=SHARD_TABLES):
+    with engine.connect() as conn:
+        for path in shard_paths:
+            conn.execute(text("ATTACH DATABASE :path AS shard"), {"path": path})
+            for table_name in tables:
+                # Rowid keys (task events) are renumbered by the target.
+                columns = ", ".join(
+                    c.name for c in Base.metadata.tables[table_name].columns
+                    if not (c.primary_key and isinstance(c.type, Integer))
+                )
+                conn.execute(text(
+                    f"INSERT INTO main.{table_name} ({columns}) SELECT {columns} FROM shard.{table_name}"
+                ))
+            # SQLite refuses to DETACH while the copy's transaction is open.
+            conn.commit()
+            conn.execute(text("DETACH DATABASE shard"))
+            conn.commit()
+
+    for path in shard_paths:
+        os.remove(path)
+    logger.info(f"Merged {len(shard_paths)} shards into the main database")
@@ -1,104 +1,339 @@
-import random
 import logging
 import os
 import math
+import sqlite3
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import func, select
 from sqlalchemy.orm import sessionmaker
 from tqdm import tqdm 
 
 load_dotenv()
 
-from models.database import Base, Organization, Team, User
-from scrapers.company_fetcher import fetch_real_company_names
-from generators.users import generate_users
-from generators.projects import create_projects_for_team
-from generators.tasks import create_tasks_for_project
-from utils.constants import DEPARTMENT_ROLES
+from models.database import (
+    KEY_STRATEGIES, Base, Organization, Team, advance_integer_ids, check_key_strategy, create_secondary_indexes,
+    detect_key_strategy, get_key_strategy, set_key_strategy
+)
+from models.analytics import build_analytics, has_summary_tables
+from scrapers.company_fetcher import choose_company, company_domain
+from generators.users import generate_users, load_team_roster
+from generators.custom_fields import create_custom_field_definitions, load_custom_field_definitions
+from generators.activity import simulate_activity
+from generators.blueprints import plan_departments
+from generators.tasks import content_keys
+from generators.work import (
+    build_shard_specs, count_team_projects, delete_team_work, generate_shard, merge_shards,
+    run_team_work, teams_with_work
+)
+from exporters.stream_export import EXPORT_FORMATS, ExportSink, export_connection, export_database
+from exporters.copy_loader import LOADER_WORKERS, STORAGE_BACKENDS, create_copy_loader
+from utils.bulk import ChunkedWriter, CommitBatcher
+from utils.constants import CUSTOM_FIELD_TEMPLATES
+from utils.content_pool import ContentPool
+from utils.distributions import get_reference_time, set_reference_time
+from utils.llm_client import get_content_engine
+from utils.metrics import METRICS, METRICS_FORMATS, StageReport, StatementCounter, profiled, write_metrics
+from utils.seeding import seed_stream
+from utils.sqlite_tuning import SQLITE_PROFILES, create_tuned_engine, parse_pragma_overrides, resolve_pragmas
 
 os.makedirs("output", exist_ok=True)
-DB_PATH = "sqlite:///output/asana_simulation.sqlite"
+DB_FILE = "output/asana_simulation.sqlite"
+DB_PATH = f"sqlite:///{DB_FILE}"
+SHARD_DIR = "output/shards"
+EXPORT_DIR = "output/export"
+COPY_DIR = "output/copy"
 
 NUM_USERS = 5000 
 TARGET_TEAM_SIZE = 12
+BULK_CHUNK_SIZE = 1000
+COMMIT_EVERY_ROWS = 50000
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
 logger = logging.getLogger(__name__)
 
-def init_db():
-    engine = create_engine(DB_PATH)
-    Base.metadata.drop_all(engine)
+def init_db(pragmas=None, url=DB_PATH, rebuild=True):
+    engine = create_tuned_engine(url, pragmas)
+    if rebuild:
+        Base.metadata.drop_all(engine)
     Base.metadata.create_all(engine)
     return sessionmaker(bind=engine)
 
-def main():
-    logger.info(f"Starting Production Simulation for {NUM_USERS} Users...")
+def load_existing_org(session):
+    org = session.execute(select(Organization)).scalars().first()
+    if org is None:
+        return None, [], [], {}
+
+    teams = list(session.execute(select(Team).where(Team.org_id == org.id).order_by(Team.name)).scalars())
+    all_users, team_roster = load_team_roster(session, teams)
+
+    if get_key_strategy() == "integer":
+        # Continue allocating above every key already in the file.
+        advance_integer_ids(max_key_id(session) + 1)
+
+    return org, teams, all_users, team_roster
+
+def max_key_id(session):
+    return max(
+        session.execute(select(func.max(table.c.id))).scalar() or 0
+        for table in Base.metadata.sorted_tables
+    )
+
+def run_sharded_work(session, teams, team_roster, all_users, workers, seed=None, pragmas=None, custom_fields=None,
+                     open_task_cap=None):
+    session.commit()
+    # Shard key ranges sit above every key already in the file, so a resumed
+    # or regenerated integer-key run cannot collide with existing rows.
+    id_base = max_key_id(session) if get_key_strategy() == "integer" else 0
+
+    specs = build_shard_specs(
+        teams, team_roster, all_users, workers, SHARD_DIR,
+        seed=seed, chunk_size=BULK_CHUNK_SIZE, pragmas=pragmas, reference_time=get_reference_time(),
+        custom_fields=custom_fields, open_task_cap=open_task_cap, id_base=id_base
+    )
+    logger.info(f"   -> Split {len(teams)} Teams into {len(specs)} shards")
+
+    total_projects = 0
+    total_tasks = 0
+    shard_paths = []
+
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        for db_path, num_projects, num_tasks, shard_metrics in tqdm(
+            pool.map(generate_shard, specs), total=len(specs), desc="Processing Shards"
+        ):
+            METRICS.merge(shard_metrics)
+            shard_paths.append(db_path)
+            total_projects += num_projects
+            total_tasks += num_tasks
+
+    merge_shards(session.get_bind(), shard_paths)
+    return total_projects, total_tasks
+
+def custom_field_count(value):
+    count = int(value)
+    if not 0 <= count <= len(CUSTOM_FIELD_TEMPLATES):
+        raise argparse.ArgumentTypeError(f"must be between 0 and {len(CUSTOM_FIELD_TEMPLATES)}, got {count}")
+    return count
+
+def main(workers=1, seed=None, pragmas=None, commit_every=COMMIT_EVERY_ROWS,
+         export_format=None, export_dir=EXPORT_DIR, direct_export=False,
+         num_users=NUM_USERS, db_file=DB_FILE, company_name=None, key_strategy=None,
+         as_of=None, resume=False, regenerate_teams=None, append_teams=None,
+         num_custom_fields=len(CUSTOM_FIELD_TEMPLATES), analytics=False,
+         backend="sqlite", database_url=None, copy_dir=COPY_DIR, loader_workers=LOADER_WORKERS,
+         max_open_tasks=None, metrics_out=None, metrics_format="json", profile_out=None,
+         team_size=TARGET_TEAM_SIZE, department_mix=None, activity=False):
+    logger.info(f"Starting Production Simulation for {num_users} Users...")
+    db_url = f"sqlite:///{db_file}"
+
+    regenerate_teams = set(regenerate_teams or [])
+    append_teams = set(append_teams or [])
+    incremental = resume or bool(regenerate_teams) or bool(append_teams)
+
+    if incremental and os.path.exists(db_file):
+        # An existing file keeps the key layout it was generated with.
+        conn = sqlite3.connect(f"file:{db_file}?mode=ro", uri=True)
+        try:
+            key_strategy = check_key_strategy(detect_key_strategy(conn), key_strategy)
+        finally:
+            conn.close()
+    if key_strategy:
+        set_key_strategy(key_strategy)
+    logger.info(f"   -> Key strategy: {get_key_strategy()}")
+    streaming = direct_export or backend != "sqlite"
     
-    Session = init_db()
+    if direct_export and backend != "sqlite":
+        raise ValueError("Direct export writes flat files; it cannot be combined with another backend")
+    if streaming and workers > 1:
+        raise ValueError("Direct export and non-SQLite backends cannot be combined with sharded workers")
+    if streaming and incremental:
+        raise ValueError("Only the SQLite backend can resume or regenerate an existing database")
+    if streaming and (analytics or activity or export_format and not direct_export):
+        raise ValueError("Analytics tables, activity history and exports need the SQLite output")
+
+    if seed is not None:
+        # Timelines are relative to "now"; pin it so reruns are identical.
+        if as_of is None:
+            as_of = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        logger.info(f"   -> Seed {seed}, timelines as of {as_of.isoformat()}")
+    set_reference_time(as_of)
+
+    # Direct export and the COPY backends keep only the organization and teams
+    # in an in-memory database; every bulk table streams straight to the sink.
+    Session = init_db(pragmas, url="sqlite://" if streaming else db_url, rebuild=not incremental)
     session = Session()
+    content_source = None
+    report = StageReport(StatementCounter().attach(Session.kw["bind"]))
+    sink = None
+    if direct_export:
+        sink = ExportSink(export_dir, export_format or "jsonl")
+    elif backend != "sqlite":
+        sink = create_copy_loader(backend, database_url, copy_dir, workers=loader_workers)
+        logger.info(f"   -> Storage backend: {backend} ({loader_workers} loader threads)")
+    if sink is not None:
+        session.info["row_sink"] = sink
     
     try:
-        logger.info("Stage 1: Creating Organization")
-        company_names = fetch_real_company_names(limit=5)
-        chosen_name = random.choice(company_names) if company_names else "Globex Corp"
-        
-        org = Organization(name=chosen_name, domain=f"{chosen_name.lower().replace(' ', '')}.com")
-        session.add(org)
-        session.flush()
-        logger.info(f"   -> Company: {org.name}")
+        org, teams, all_users, team_roster = load_existing_org(session) if incremental else (None, [], [], {})
+        if incremental and org is None:
+            raise ValueError(f"Nothing to resume: {db_file} has no organization")
 
-        num_teams_needed = math.ceil(NUM_USERS / TARGET_TEAM_SIZE)
-        logger.info(f"Stage 2: Scaling Architecture to {num_teams_needed} Teams")
-        
-        teams = []
-        dept_names = list(DEPARTMENT_ROLES.keys())
-        
-        for i in range(num_teams_needed):
-            dept = dept_names[i % len(dept_names)] 
-            team_num = (i // len(dept_names)) + 1
-            
-            team = Team(
-                org_id=org.id, 
-                name=f"{dept} - Squad {team_num}", 
-                description=f"{dept} Unit {team_num}"
-            )
-            session.add(team)
-            teams.append(team)
-            
-        session.flush()
-        logger.info(f"   -> Created {len(teams)} Teams across {len(dept_names)} Departments.")
+        if org is not None:
+            logger.info(f"Loaded {org.name}: {len(teams)} Teams, {len(all_users)} Employees")
+            custom_fields = load_custom_field_definitions(session, org.id)
+            seeded_work = [(team, 0) for team in teams if team.name in regenerate_teams]
+            for team, _ in seeded_work:
+                delete_team_work(session, team.id)
+            seeded_work += [
+                (team, count_team_projects(session, team.id)) for team in teams if team.name in append_teams
+            ]
+            if resume:
+                # Teams queued above were just cleared; don't generate them twice.
+                done = teams_with_work(session) | {team.id for team, _ in seeded_work}
+                resumed = [(team, 0) for team in teams if team.id not in done]
+                seeded_work += resumed
+                logger.info(f"   -> Resuming {len(resumed)} Teams without work")
 
-        logger.info(f"Stage 3: Mass Hiring {NUM_USERS} Employees")
-        all_users = generate_users(session, org.id, teams, NUM_USERS)
-        
-        logger.info("Stage 4: Generating Enterprise Work History")
-        
-        total_projects = 0
-        total_tasks = 0
+            missing = (regenerate_teams | append_teams) - {team.name for team in teams}
+            if missing:
+                raise ValueError(f"Unknown team(s): {sorted(missing)}")
+        else:
+            with report.stage("organization") as stage:
+                logger.info("Stage 1: Creating Organization")
+                seed_stream(seed, "organization")
+                if company_name:
+                    company = {"name": company_name, "domain": company_domain(company_name)}
+                else:
+                    company = choose_company(limit=5)
+                
+                org = Organization(name=company["name"], domain=company["domain"])
+                session.add(org)
+                session.flush()
+                stage["rows"] = 1
+                logger.info(f"   -> Company: {org.name}")
 
-        for team in tqdm(teams, desc="Processing Teams"):
-            projects = create_projects_for_team(session, team, num_projects=random.randint(1, 4))
-            total_projects += len(projects)
-            
-            for proj in projects:
-                team_members = [
-                    u for u in all_users 
-                    if u.memberships and any(m.team_id == team.id for m in u.memberships)
-                ]
+            with report.stage("teams") as stage:
+                num_teams_needed = math.ceil(num_users / team_size)
+                logger.info(f"Stage 2: Scaling Architecture to {num_teams_needed} Teams")
+                
+                teams = []
+                squads = {}
                 
-                if not team_members: 
-                    team_members = random.sample(all_users, min(3, len(all_users)))
+                for dept in plan_departments(num_teams_needed, department_mix):
+                    team_num = squads.get(dept, 0) + 1
+                    squads[dept] = team_num
+                    
+                    team = Team(
+                        org_id=org.id, 
+                        name=f"{dept} - Squad {team_num}", 
+                        department=dept,
+                        description=f"{dept} Unit {team_num}"
+                    )
+                    session.add(team)
+                    teams.append(team)
+                    
+                session.flush()
+                stage["rows"] = len(teams)
+                logger.info(f"   -> Created {len(teams)} Teams across {len(squads)} Departments.")
 
-                tasks = create_tasks_for_project(session, proj, team_members)
-                total_tasks += len(tasks)
+            with report.stage("users") as stage:
+                logger.info(f"Stage 3: Mass Hiring {num_users} Employees")
+                all_users, team_roster = generate_users(
+                    session, org.id, teams, num_users, chunk_size=BULK_CHUNK_SIZE, domain=org.domain,
+                    rng=seed_stream(seed, "users")
+                )
+                session.commit()
+                stage["rows"] = len(all_users) + sum(len(members) for members in team_roster.values())
 
-            if len(teams) > 100 and team.id.endswith("0"): 
+            with report.stage("custom fields") as stage:
+                custom_fields = create_custom_field_definitions(
+                    session, org.id, count=num_custom_fields, chunk_size=BULK_CHUNK_SIZE
+                )
                 session.commit()
+                stage["rows"] = len(custom_fields)
 
-        logger.info("Final Database Commit...")
-        session.commit()
+            seeded_work = [(team, 0) for team in teams]
         
-        file_size_mb = os.path.getsize("output/asana_simulation.sqlite") / (1024 * 1024)
+        with report.stage("work") as stage, profiled(profile_out):
+            logger.info(f"Stage 4: Generating Enterprise Work History for {len(seeded_work)} Teams")
+            
+            if workers > 1 and all(generation == 0 for _, generation in seeded_work):
+                total_projects, total_tasks = run_sharded_work(
+                    session, [team for team, _ in seeded_work], team_roster, all_users, workers,
+                    seed=seed, pragmas=pragmas, custom_fields=custom_fields, open_task_cap=max_open_tasks
+                )
+            else:
+                engine = get_content_engine()
+                if engine.model is not None and seed is None:
+                    content_source = ContentPool(engine, content_keys()).start()
+
+                total_projects = 0
+                total_tasks = 0
+                writer = ChunkedWriter(session, BULK_CHUNK_SIZE)
+                batcher = CommitBatcher(session, commit_every, writer=writer)
+
+                for team, generation in tqdm(seeded_work, desc="Processing Teams"):
+                    added_before = writer.rows_added
+                    num_projects, num_tasks = run_team_work(
+                        session, team, team_roster, all_users, seed=seed, generation=generation,
+                        chunk_size=BULK_CHUNK_SIZE, content_source=content_source,
+                        report=report, writer=writer, custom_fields=custom_fields,
+                        open_task_cap=max_open_tasks
+                    )
+                    total_projects += num_projects
+                    total_tasks += num_tasks
+                    # Commits only land on team boundaries, so a resumed run
+                    # never sees a half-written team. Sections and custom field
+                    # values count toward the threshold too.
+                    batcher.add(writer.rows_added - added_before)
+
+                logger.info("Final Database Commit...")
+                batcher.commit()
+            stage["rows"] = total_projects + total_tasks
+
+        if sink is not None:
+            if direct_export:
+                output_summary = f"{export_dir} ({sink.fmt}, no SQLite file)"
+            elif backend == "postgres":
+                output_summary = sink.target.engine.url.render_as_string()
+            else:
+                output_summary = f"{copy_dir} (COPY files and load.sql)"
+
+            with report.stage("export" if direct_export else "load") as stage:
+                logger.info(f"Stage 5: Streaming Remaining Tables to {output_summary}")
+                export_connection(session.connection().connection.driver_connection, sink)
+                sink.close()
+                stage["rows"] = sum(sink.row_counts.values())
+        else:
+            if activity:
+                with report.stage("activity") as stage:
+                    logger.info("Stage 4b: Simulating Task Activity History")
+                    # Incremental runs only fill in tasks that have no history yet.
+                    stage["rows"] = simulate_activity(
+                        session, seed=seed, only_missing=incremental, chunk_size=BULK_CHUNK_SIZE
+                    )
+
+            with report.stage("indexes"):
+                logger.info("Stage 5: Building Secondary Indexes")
+                create_secondary_indexes(session.get_bind())
+
+            # Summary tables left by an earlier --analytics run would be stale
+            # after an incremental run, so they are rebuilt too.
+            if analytics or incremental and has_summary_tables(session.get_bind()):
+                with report.stage("analytics") as stage:
+                    logger.info("Stage 6: Building Analytics Indexes and Summary Tables")
+                    stage["rows"] = build_analytics(session.get_bind())
+
+            if export_format:
+                with report.stage("export") as stage:
+                    logger.info(f"Stage 7: Exporting to {export_dir} as {export_format}")
+                    stage["rows"] = sum(export_database(db_file, export_dir, export_format).values())
+
+            file_size_mb = os.path.getsize(db_file) / (1024 * 1024)
+            output_summary = f"{db_url} ({file_size_mb:.2f} MB)"
 
         print("\n" + "="*40)
         print("PRODUCTION BUILD COMPLETE")
@@ -107,15 +342,96 @@ def main():
         print(f"Teams:     {len(teams)}")
         print(f"Projects:  {total_projects}")
         print(f"Tasks:     {total_tasks}")
-        print(f"Database:  {DB_PATH} ({file_size_mb:.2f} MB)")
+        print(f"Output:    {output_summary}")
+        print("-"*40)
+        for line in report.lines():
+            print(line)
         print("="*40 + "\n")
 
+        if metrics_out:
+            write_metrics(metrics_out, report, metrics_format)
+
+        return {
+            "num_users": num_users,
+            "employees": len(all_users),
+            "teams": len(teams),
+            "projects": total_projects,
+            "tasks": total_tasks,
+            "stages": report.stages
+        }
+
     except Exception as e:
         logger.error(f"Simulation Failed: {e}")
         session.rollback()
         raise e
     finally:
+        if content_source is not None:
+            content_source.stop()
         session.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate a simulated Asana workspace.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Generate Stage 4 in N processes, sharded by team")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Make the run reproducible; every team gets a substream derived from this seed")
+    parser.add_argument("--as-of", type=datetime.fromisoformat, default=None,
+                        help="Reference date for task timelines (seeded runs default to today, 00:00 UTC)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Keep the existing database and generate work only for teams that have none")
+    parser.add_argument("--regenerate-team", action="append", default=[], metavar="TEAM_NAME",
+                        help="Delete and regenerate one team's projects and tasks")
+    parser.add_argument("--append-team", action="append", default=[], metavar="TEAM_NAME",
+                        help="Add another batch of projects and tasks to one team")
+    parser.add_argument("--sqlite-profile", choices=sorted(SQLITE_PROFILES), default="default",
+                        help="SQLite PRAGMA profile; 'bulk' trades durability for load speed")
+    parser.add_argument("--pragma", action="append", default=[], metavar="KEY=VALUE",
+                        help="Override a single PRAGMA, e.g. --pragma cache_size=-65536")
+    parser.add_argument("--commit-every", type=int, default=COMMIT_EVERY_ROWS,
+                        help="Commit Stage 4 after this many generated rows")
+    parser.add_argument("--export-format", choices=EXPORT_FORMATS, default=None,
+                        help="Also stream every table to flat files in this format")
+    parser.add_argument("--export-dir", default=EXPORT_DIR)
+    parser.add_argument("--activity", action="store_true",
+                        help="Simulate section moves, reassignments and comments into task_events")
+    parser.add_argument("--analytics", action="store_true",
+                        help="Build covering indexes and summary tables after generation")
+    parser.add_argument("--custom-fields", type=custom_field_count, default=len(CUSTOM_FIELD_TEMPLATES),
+                        help=f"Custom fields per task, up to {len(CUSTOM_FIELD_TEMPLATES)} (0 disables them)")
+    parser.add_argument("--max-open-tasks", type=int, default=None,
+                        help="Cap the open (incomplete) tasks any one user is assigned")
+    parser.add_argument("--metrics-out", default=None, metavar="PATH",
+                        help="Write SQL counters, call latency histograms and LLM counters to this file")
+    parser.add_argument("--metrics-format", choices=METRICS_FORMATS, default="json")
+    parser.add_argument("--profile-stage4", default=None, metavar="PATH",
+                        help="Run Stage 4 under cProfile and dump the stats to this file")
+    parser.add_argument("--key-strategy", choices=KEY_STRATEGIES, default=None,
+                        help="Primary/foreign key layout (default: uuid4 text)")
+    parser.add_argument("--direct-export", action="store_true",
+                        help="Write straight to the export files without producing a SQLite file")
+    parser.add_argument("--backend", choices=STORAGE_BACKENDS, default="sqlite",
+                        help="Where rows are stored; postgres and copy-files stream through COPY")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"),
+                        help="PostgreSQL URL for --backend postgres (default: $DATABASE_URL)")
+    parser.add_argument("--copy-dir", default=COPY_DIR,
+                        help="Output directory for --backend copy-files")
+    parser.add_argument("--loader-workers", type=int, default=LOADER_WORKERS,
+                        help="Parallel COPY loaders (and pooled connections) for the COPY backends")
+    args = parser.parse_args()
+
+    if args.direct_export and args.workers > 1:
+        parser.error("--direct-export cannot be combined with --workers")
+    if args.backend != "sqlite" and args.workers > 1:
+        parser.error(f"--backend {args.backend} cannot be combined with --workers")
+
+    pragmas = resolve_pragmas(args.sqlite_profile, parse_pragma_overrides(args.pragma))
+    main(
+        workers=args.workers, seed=args.seed, pragmas=pragmas, commit_every=args.commit_every,
+        export_format=args.export_format, export_dir=args.export_dir, direct_export=args.direct_export,
+        key_strategy=args.key_strategy, as_of=args.as_of, resume=args.resume,
+        regenerate_teams=args.regenerate_team, append_teams=args.append_team,
+        num_custom_fields=args.custom_fields, analytics=args.analytics, activity=args.activity,
+        backend=args.backend, database_url=args.database_url, copy_dir=args.copy_dir,
+        loader_workers=args.loader_workers, max_open_tasks=args.max_open_tasks,
+        metrics_out=args.metrics_out, metrics_format=args.metrics_format, profile_out=args.profile_stage4
+    )
@@ -0,0 +1,81 @@
+import logging
+from sqlalchemy import inspect, text
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_memberships_team ON team_memberships(team_id, role, user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_memberships_user ON team_memberships(user_id, team_id)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_section ON tasks(section_id)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks(is_completed)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_project_completed ON tasks(project_id, is_completed)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_assignee_completed ON tasks(assignee_id, is_completed)",
+]
+
+SUMMARY_TABLES = {
+    "team_member_counts": """
+        SELECT
+            t.id AS team_id,
+            t.name AS team_name,
+            COUNT(tm.user_id) AS member_count,
+            COALESCE(SUM(tm.role = 'admin'), 0) AS admin_count
+        FROM teams t
+        LEFT JOIN team_memberships tm ON tm.team_id = t.id
+        GROUP BY t.id
+    """,
+    "project_completion": """
+        SELECT
+            p.id AS project_id,
+            p.team_id AS team_id,
+            p.name AS project_name,
+            COUNT(tk.id) AS total_tasks,
+            COALESCE(SUM(tk.is_completed), 0) AS completed_tasks,
+            CASE WHEN COUNT(tk.id) = 0 THEN 0.0
+                 ELSE ROUND(1.0 * SUM(tk.is_completed) / COUNT(tk.id), 4) END AS completion_rate
+        FROM projects p
+        LEFT JOIN tasks tk ON tk.project_id = p.id
+        GROUP BY p.id
+    """,
+    "user_workload": """
+        SELECT
+            u.id AS user_id,
+            u.full_name AS full_name,
+            COUNT(tk.id) AS assigned_tasks,
+            COALESCE(SUM(tk.is_completed = 0), 0) AS open_tasks,
+            COALESCE(SUM(tk.is_completed), 0) AS completed_tasks
+        FROM users u
+        LEFT JOIN tasks tk ON tk.assignee_id = u.id
+        GROUP BY u.id
+    """,
+}
+
+SUMMARY_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_team_member_counts_size ON team_member_counts(member_count DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_project_completion_team ON project_completion(team_id)",
+    "CREATE INDEX IF NOT EXISTS idx_user_workload_open ON user_workload(open_tasks DESC)",
+]
+
+def has_summary_tables(engine):
+    existing = set(inspect(engine).get_table_names())
+    return any(table_name in existing for table_name in SUMMARY_TABLES)
+
+def build_analytics(engine):
+    # The covering indexes go in first so the summary aggregates below can
+    # use them instead of scanning tasks.
+    with engine.begin() as conn:
+        for ddl in ANALYTICS_INDEXES:
+            conn.execute(text(ddl))
+
+        rows = 0
+        for table_name, query in SUMMARY_TABLES.items():
+            conn.execute(text(f"DROP TABLE IF EXISTS {table_name}"))
+            conn.execute(text(f"CREATE TABLE {table_name} AS {query}"))
+            rows += conn.execute(text(f"SELECT COUNT(*) FROM {table_name}")).scalar_one()
+
+        for ddl in SUMMARY_INDEXES:
+            conn.execute(text(ddl))
+
+        conn.execute(text("ANALYZE"))
+
+    logger.info(f"Built {len(SUMMARY_TABLES)} summary tables ({rows} rows) and {len(ANALYTICS_INDEXES)} indexes")
+    return rows
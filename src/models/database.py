@@ -1,16 +1,120 @@
+import os
+import time
 import uuid
+import random
+import itertools
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Float
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Float, LargeBinary, text
 from sqlalchemy.orm import relationship, declarative_base
+from sqlalchemy.types import TypeDecorator
 
 Base = declarative_base()
 
+# uuid4:   36-char random UUID text (the original layout)
+# uuid7:   36-char time-ordered UUID text, so B-tree inserts stay append-only
+# blob:    time-ordered UUID stored as 16 raw bytes
+# integer: INTEGER PRIMARY KEY rowids allocated client-side
+KEY_STRATEGIES = ["uuid4", "uuid7", "blob", "integer"]
+
+# Each integer-key shard allocates from its own 2**40 block so shards merge
+# without collisions.
+SHARD_KEY_SPACE = 1 << 40
+
+_key_strategy = os.environ.get("ASANA_KEY_STRATEGY", "uuid4")
+_integer_ids = itertools.count(1)
+_key_rng = random.Random()
+
+def set_key_strategy(strategy, shard=0, base=0):
+    global _key_strategy, _integer_ids
+    if strategy not in KEY_STRATEGIES:
+        raise ValueError(f"Unknown key strategy '{strategy}'. Choose from {KEY_STRATEGIES}")
+
+    _key_strategy = strategy
+    _integer_ids = itertools.count(base + shard * SHARD_KEY_SPACE + 1)
+    # Spawned worker processes pick the strategy up at import time.
+    os.environ["ASANA_KEY_STRATEGY"] = strategy
+
+def get_key_strategy():
+    return _key_strategy
+
+def seed_keys(seed):
+    _key_rng.seed(seed)
+
+def advance_integer_ids(next_id):
+    global _integer_ids
+    _integer_ids = itertools.count(next_id)
+
+def _uuid7():
+    unix_ms = time.time_ns() // 1_000_000
+    rand = _key_rng.getrandbits(80)
+    value = (unix_ms & ((1 << 48) - 1)) << 80
+    value |= 0x7 << 76
+    value |= (rand >> 68) << 64
+    value |= 0b10 << 62
+    value |= rand & ((1 << 62) - 1)
+    return uuid.UUID(int=value)
+
 def generate_uuid():
-    return str(uuid.uuid4())
+    if _key_strategy == "uuid7":
+        return str(_uuid7())
+    if _key_strategy == "blob":
+        return _uuid7().bytes
+    if _key_strategy == "integer":
+        return next(_integer_ids)
+    return str(uuid.UUID(int=_key_rng.getrandbits(128), version=4))
+
+def detect_key_strategy(conn):
+    # Reads the key layout back from an existing SQLite file: integer and
+    # blob keys by the declared type of organizations.id, text keys by the
+    # UUID version of a stored key. None when the file can't tell.
+    declared = {row[1]: (row[2] or "").upper() for row in conn.execute("PRAGMA table_info(organizations)")}
+    if "id" not in declared:
+        return None
+    if "INT" in declared["id"]:
+        return "integer"
+    if "BLOB" in declared["id"] or "BINARY" in declared["id"]:
+        return "blob"
+
+    row = conn.execute("SELECT id FROM organizations LIMIT 1").fetchone()
+    if row is None:
+        return None
+    try:
+        return "uuid7" if uuid.UUID(str(row[0])).version == 7 else "uuid4"
+    except ValueError:
+        return None
+
+def check_key_strategy(stored, requested=None):
+    if stored and requested and stored != requested:
+        raise ValueError(f"The database uses {stored} keys, but the {requested} key strategy was requested")
+    return stored or requested or _key_strategy
+
+class KeyType(TypeDecorator):
+    impl = String
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if _key_strategy == "blob":
+            return dialect.type_descriptor(LargeBinary(16))
+        if _key_strategy == "integer":
+            return dialect.type_descriptor(Integer())
+        return dialect.type_descriptor(String())
+
+# Built after the bulk load rather than maintained row by row during it.
+SECONDARY_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_project ON tasks(project_id)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_assignee ON tasks(assignee_id)",
+    "CREATE INDEX IF NOT EXISTS idx_task_events_task ON task_events(task_id, occurred_at)",
+]
+
+def create_secondary_indexes(engine):
+    with engine.begin() as conn:
+        for ddl in SECONDARY_INDEXES:
+            conn.execute(text(ddl))
 
 class Organization(Base):
     __tablename__ = 'organizations'
-    id = Column(String, primary_key=True, default=generate_uuid)
+    id = Column(KeyType, primary_key=True, default=generate_uuid)
     name = Column(String, nullable=False)
     domain = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -21,9 +125,10 @@ class Organization(Base):
 
 class Team(Base):
     __tablename__ = 'teams'
-    id = Column(String, primary_key=True, default=generate_uuid)
-    org_id = Column(String, ForeignKey('organizations.id'))
+    id = Column(KeyType, primary_key=True, default=generate_uuid)
+    org_id = Column(KeyType, ForeignKey('organizations.id'))
     name = Column(String, nullable=False)
+    department = Column(String)
     description = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -33,8 +138,8 @@ class Team(Base):
 
 class User(Base):
     __tablename__ = 'users'
-    id = Column(String, primary_key=True, default=generate_uuid)
-    org_id = Column(String, ForeignKey('organizations.id'))
+    id = Column(KeyType, primary_key=True, default=generate_uuid)
+    org_id = Column(KeyType, ForeignKey('organizations.id'))
     full_name = Column(String, nullable=False)
     email = Column(String, nullable=False, unique=True)
     role = Column(String)
@@ -47,9 +152,9 @@ class User(Base):
 
 class TeamMembership(Base):
     __tablename__ = 'team_memberships'
-    id = Column(String, primary_key=True, default=generate_uuid)
-    user_id = Column(String, ForeignKey('users.id'))
-    team_id = Column(String, ForeignKey('teams.id'))
+    id = Column(KeyType, primary_key=True, default=generate_uuid)
+    user_id = Column(KeyType, ForeignKey('users.id'))
+    team_id = Column(KeyType, ForeignKey('teams.id'))
     role = Column(String, default="member")
     joined_at = Column(DateTime, default=datetime.utcnow)
     
@@ -58,8 +163,8 @@ class TeamMembership(Base):
 
 class Project(Base):
     __tablename__ = 'projects'
-    id = Column(String, primary_key=True, default=generate_uuid)
-    team_id = Column(String, ForeignKey('teams.id'))
+    id = Column(KeyType, primary_key=True, default=generate_uuid)
+    team_id = Column(KeyType, ForeignKey('teams.id'))
     name = Column(String, nullable=False)
     status = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -70,8 +175,8 @@ class Project(Base):
 
 class Section(Base):
     __tablename__ = 'sections'
-    id = Column(String, primary_key=True, default=generate_uuid)
-    project_id = Column(String, ForeignKey('projects.id'))
+    id = Column(KeyType, primary_key=True, default=generate_uuid)
+    project_id = Column(KeyType, ForeignKey('projects.id'))
     name = Column(String, nullable=False)
     rank = Column(Integer)
     
@@ -80,10 +185,10 @@ class Section(Base):
 
 class Task(Base):
     __tablename__ = 'tasks'
-    id = Column(String, primary_key=True, default=generate_uuid)
-    project_id = Column(String, ForeignKey('projects.id'))
-    section_id = Column(String, ForeignKey('sections.id'))
-    assignee_id = Column(String, ForeignKey('users.id'), nullable=True)
+    id = Column(KeyType, primary_key=True, default=generate_uuid)
+    project_id = Column(KeyType, ForeignKey('projects.id'))
+    section_id = Column(KeyType, ForeignKey('sections.id'))
+    assignee_id = Column(KeyType, ForeignKey('users.id'), nullable=True)
     name = Column(String, nullable=False)
     description = Column(String)
     priority = Column(String)
@@ -99,10 +204,11 @@ class Task(Base):
 
 class CustomFieldDefinition(Base):
     __tablename__ = 'custom_field_definitions'
-    id = Column(String, primary_key=True, default=generate_uuid)
-    org_id = Column(String, ForeignKey('organizations.id'))
+    id = Column(KeyType, primary_key=True, default=generate_uuid)
+    org_id = Column(KeyType, ForeignKey('organizations.id'))
     name = Column(String, nullable=False)
     field_type = Column(String, nullable=False) 
+    enum_options = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     organization = relationship("Organization", back_populates="custom_fields")
@@ -110,12 +216,25 @@ class CustomFieldDefinition(Base):
 
 class CustomFieldValue(Base):
     __tablename__ = 'custom_field_values'
-    id = Column(String, primary_key=True, default=generate_uuid)
-    task_id = Column(String, ForeignKey('tasks.id'))
-    field_definition_id = Column(String, ForeignKey('custom_field_definitions.id'))
+    id = Column(KeyType, primary_key=True, default=generate_uuid)
+    task_id = Column(KeyType, ForeignKey('tasks.id'))
+    field_definition_id = Column(KeyType, ForeignKey('custom_field_definitions.id'))
     value_text = Column(String, nullable=True)
     value_number = Column(Float, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     task = relationship("Task", back_populates="custom_field_values")
-    definition = relationship("CustomFieldDefinition", back_populates="values")
\ No newline at end of file
+    definition = relationship("CustomFieldDefinition", back_populates="values")
+
+class TaskEvent(Base):
+    # Append-only history written by the activity simulation. Events get a
+    # plain rowid key: they are never referenced, only scanned.
+    __tablename__ = 'task_events'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(KeyType, ForeignKey('tasks.id'), nullable=False)
+    event_type = Column(String, nullable=False)
+    occurred_at = Column(DateTime, nullable=False)
+    actor_id = Column(KeyType, ForeignKey('users.id'), nullable=True)
+    section_id = Column(KeyType, ForeignKey('sections.id'), nullable=True)
+    assignee_id = Column(KeyType, ForeignKey('users.id'), nullable=True)
+    detail = Column(String)
\ No newline at end of file
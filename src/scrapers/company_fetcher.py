@@ -1,42 +1,128 @@
-import requests
-from bs4 import BeautifulSoup
-import logging
+import os
+import re
+import json
 import random
+import logging
+import argparse
+from datetime import datetime, timedelta, timezone
 
 logger = logging.getLogger(__name__)
 
-def fetch_real_company_names(limit=5):
-    url = "https://en.wikipedia.org/wiki/List_of_S&P_500_companies"
+SOURCE_URL = "https://en.wikipedia.org/wiki/List_of_S&P_500_companies"
+SHIPPED_CATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "company_catalog.json")
+LOCAL_CATALOG = os.environ.get("COMPANY_CATALOG_PATH", "output/company_catalog.json")
+CATALOG_TTL = timedelta(days=30)
+
+_NAME_SUFFIXES = r"\b(inc|corporation|corp|company|group|holdings|the|and|co)\b"
+
+def company_domain(name):
+    slug = re.sub(r"\(.*?\)", "", name.lower())
+    slug = re.sub(_NAME_SUFFIXES, "", slug)
+    slug = re.sub(r"[^a-z0-9]", "", slug)
+    return f"{slug or 'company'}.com"
+
+def _read_catalog(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def _catalog_age(catalog):
+    fetched_at = datetime.fromisoformat(catalog["fetched_at"])
+    return datetime.now(timezone.utc) - fetched_at
+
+def load_company_catalog():
+    # Hot path: local files only. A refreshed catalog wins over the shipped one.
+    path = LOCAL_CATALOG if os.path.exists(LOCAL_CATALOG) else SHIPPED_CATALOG
+    try:
+        catalog = _read_catalog(path)
+    except Exception as e:
+        logger.warning(f"Could not read company catalog {path}: {e}. Using fallback names.")
+        return [{"name": name, "domain": company_domain(name)} for name in _fallback_names()]
+
+    # The shipped catalog is a fixed snapshot; only a refreshed local copy
+    # can go stale.
+    if path == LOCAL_CATALOG and _catalog_age(catalog) > CATALOG_TTL:
+        logger.info(
+            f"Company catalog is older than {CATALOG_TTL.days} days; "
+            f"refresh it with: python src/scrapers/company_fetcher.py --refresh"
+        )
+    return catalog["companies"]
+
+def choose_company(limit=5):
+    companies = load_company_catalog()
+    return random.choice(random.sample(companies, min(limit, len(companies))))
+
+def parse_company_table(html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
     
+    table = soup.find('table', {'id': 'constituents'})
+    if not table:
+        return []
+        
+    companies = []
+    for row in table.find_all('tr')[1:]:
+        cols = row.find_all('td')
+        if cols:
+            name = cols[1].get_text(strip=True)
+            companies.append({"name": name, "domain": company_domain(name)})
+    return companies
+
+def scrape_company_catalog():
+    import requests
+
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
     }
 
-    try:
-        logger.info(f"Scraping company names from {url}")
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        table = soup.find('table', {'id': 'constituents'})
-        if not table:
-            logger.warning("Could not find the table. Using fallback names.")
-            return _fallback_names()
-            
-        companies = []
-        for row in table.find_all('tr')[1:]:
-            cols = row.find_all('td')
-            if cols:
-                name = cols[1].get_text(strip=True)
-                companies.append(name)
-        
-        random.shuffle(companies)
-        return companies[:limit]
+    logger.info(f"Scraping company names from {SOURCE_URL}")
+    response = requests.get(SOURCE_URL, headers=headers, timeout=10)
+    response.raise_for_status()
+    return parse_company_table(response.text)
 
-    except Exception as e:
-        logger.warning(f"Scraping failed: {e}. Switching to fallback data.")
-        return _fallback_names()
+def refresh_company_catalog(path=LOCAL_CATALOG, force=False, html_path=None):
+    if not force and html_path is None and os.path.exists(path):
+        age = _catalog_age(_read_catalog(path))
+        if age <= CATALOG_TTL:
+            logger.info(f"Company catalog is {age.days} days old; nothing to refresh")
+            return path
+
+    if html_path is not None:
+        with open(html_path, encoding="utf-8") as f:
+            companies = parse_company_table(f.read())
+    else:
+        companies = scrape_company_catalog()
+
+    if not companies:
+        raise ValueError("Could not find the constituents table; catalog left unchanged")
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "source": html_path or SOURCE_URL,
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+            "companies": companies
+        }, f, indent=2)
+
+    logger.info(f"Wrote {len(companies)} companies to {path}")
+    return path
 
 def _fallback_names():
-    return ["Acme Corp", "Globex Corporation", "Soylent Corp", "Initech", "Umbrella Corp", "Stark Industries", "Wayne Enterprises"]
\ No newline at end of file
+    return ["Acme Corp", "Globex Corporation", "Soylent Corp", "Initech", "Umbrella Corp", "Stark Industries", "Wayne Enterprises"]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the local company catalog.")
+    parser.add_argument("--refresh", action="store_true", help="Re-scrape the catalog if it is older than the TTL")
+    parser.add_argument("--force", action="store_true", help="Refresh even if the catalog is still fresh")
+    parser.add_argument("--from-html", default=None, help="Build the catalog from a saved HTML page instead")
+    parser.add_argument("--out", default=LOCAL_CATALOG)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
+    if args.refresh or args.from_html:
+        refresh_company_catalog(args.out, force=args.force, html_path=args.from_html)
+    else:
+        for company in load_company_catalog():
+            print(f"{company['name']:<40}{company['domain']}")
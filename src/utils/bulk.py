@@ -0,0 +1,91 @@
+import logging
+from itertools import islice
+from sqlalchemy import insert
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+def chunked(rows, chunk_size):
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def bulk_insert(session, table, rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    # A session carrying a row sink streams bulk rows straight to it
+    # (e.g. an export writer) instead of the database.
+    sink = session.info.get("row_sink")
+
+    written = 0
+    for chunk in chunked(rows, chunk_size):
+        if sink is not None:
+            sink.write(table, chunk)
+        else:
+            session.execute(insert(table), chunk)
+        written += len(chunk)
+
+    logger.debug(f"Bulk inserted {written} rows into {table.name}")
+    return written
+
+class ChunkedWriter:
+    def __init__(self, session, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.session = session
+        self.chunk_size = chunk_size
+        self.rows_written = 0
+        # Rows handed to the writer, flushed or still buffered.
+        self.rows_added = 0
+        self._buffers = {}
+
+    def add(self, table, row):
+        buffer = self._buffers.setdefault(table, [])
+        buffer.append(row)
+        self.rows_added += 1
+        if len(buffer) >= self.chunk_size:
+            self._flush_through(table)
+
+    def extend(self, table, rows):
+        for row in rows:
+            self.add(table, row)
+
+    def _flush_table(self, table):
+        buffer = self._buffers.get(table)
+        if buffer:
+            self.rows_written += bulk_insert(self.session, table, buffer, self.chunk_size)
+            self._buffers[table] = []
+
+    def _flush_through(self, table):
+        # A full buffer first flushes every table used before it, so parent
+        # rows always reach the database before the rows referencing them.
+        for buffered in list(self._buffers):
+            self._flush_table(buffered)
+            if buffered is table:
+                return
+
+    def flush(self):
+        # Buffers are flushed in first-use order, which is parent-before-child
+        # for every generator.
+        for table in list(self._buffers):
+            self._flush_table(table)
+
+class CommitBatcher:
+    def __init__(self, session, every_rows, writer=None):
+        self.session = session
+        self.every_rows = every_rows
+        self.writer = writer
+        self.pending = 0
+        self.commits = 0
+
+    def add(self, rows):
+        self.pending += rows
+        if self.every_rows and self.pending >= self.every_rows:
+            self.commit()
+
+    def commit(self):
+        if self.writer is not None:
+            self.writer.flush()
+        self.session.commit()
+        self.pending = 0
+        self.commits += 1
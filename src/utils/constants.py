@@ -33,4 +33,52 @@ PROJECT_TEMPLATES = {
         "titles": ["Employee Onboarding", "Office Move Log", "Quarterly Hiring Plan"],
         "sections": ["To Do", "In Progress", "Blocked", "Done"]
     }
-}
\ No newline at end of file
+}
+
+CUSTOM_FIELD_TEMPLATES = [
+    {
+        "name": "Effort", "field_type": "enum", "fill_rate": 0.9,
+        "options": ["XS", "S", "M", "L", "XL"], "weights": [0.1, 0.3, 0.35, 0.18, 0.07]
+    },
+    {
+        "name": "Risk Level", "field_type": "enum", "fill_rate": 0.6,
+        "options": ["Low", "Medium", "High", "Critical"], "weights": [0.45, 0.35, 0.15, 0.05]
+    },
+    {
+        "name": "Customer Impact", "field_type": "enum", "fill_rate": 0.4,
+        "options": ["None", "Minor", "Major", "Blocker"], "weights": [0.4, 0.35, 0.2, 0.05]
+    },
+    {
+        "name": "Story Points", "field_type": "number", "fill_rate": 0.7,
+        "choices": [1, 2, 3, 5, 8, 13], "weights": [0.15, 0.25, 0.25, 0.2, 0.1, 0.05]
+    },
+    {
+        "name": "Estimated Hours", "field_type": "number", "fill_rate": 0.6,
+        "lognormal": (1.5, 0.8)
+    },
+    {
+        "name": "Budget (USD)", "field_type": "number", "fill_rate": 0.2,
+        "lognormal": (7.0, 1.2)
+    },
+    {
+        "name": "Release Train", "field_type": "text", "fill_rate": 0.4,
+        "values": ["2026.1", "2026.2", "2026.3", "2026.4", "Hotfix", "Unscheduled"]
+    },
+    {
+        "name": "External Ticket", "field_type": "text", "fill_rate": 0.3,
+        "pattern": "OPS-{}", "range": (1000, 99999)
+    }
+]
+
+COMMENT_TEMPLATES = [
+    "Picking this up today.",
+    "Blocked on a dependency, will follow up.",
+    "Left some notes in the doc, can you take a look?",
+    "Moved the deadline conversation to the weekly sync.",
+    "Looks good to me.",
+    "Pushed an update, ready for another review.",
+    "Can we split this into smaller pieces?",
+    "Waiting on sign-off from the stakeholder.",
+    "Added the latest numbers.",
+    "Bumping this, still needs an owner."
+]
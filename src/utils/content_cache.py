@@ -0,0 +1,136 @@
+import os
+import json
+import time
+import random
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.environ.get("GEMINI_CONTENT_CACHE", "output/content_cache.sqlite")
+MAX_ENTRIES = int(os.environ.get("GEMINI_CONTENT_CACHE_MAX_ENTRIES", 20000))
+MIN_RESPONSES_PER_KEY = int(os.environ.get("GEMINI_CONTENT_CACHE_MIN_RESPONSES", 3))
+BUSY_TIMEOUT = 30.0
+TOUCH_FLUSH_EVERY = 256
+
+class ContentCache:
+    def __init__(self, path=CACHE_PATH, max_entries=MAX_ENTRIES, min_responses=MIN_RESPONSES_PER_KEY,
+                 read_only=False):
+        self.path = path
+        self.max_entries = max_entries
+        self.min_responses = min_responses
+        self.read_only = read_only
+        self._pools = {}
+        # LRU touches are buffered and written in batches, not one UPDATE
+        # (and an open write transaction) per lookup.
+        self._touched = {}
+        self._lock = threading.Lock()
+
+        if read_only:
+            # Parallel shard workers only read, so they never contend for the
+            # write lock.
+            self._conn = sqlite3.connect(
+                f"file:{path}?mode=ro", uri=True, timeout=BUSY_TIMEOUT, check_same_thread=False
+            )
+            return
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS content_cache (
+                id INTEGER PRIMARY KEY,
+                dept TEXT NOT NULL,
+                section_name TEXT NOT NULL,
+                task_count INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_content_cache_key ON content_cache(dept, section_name)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_content_cache_last_used ON content_cache(last_used)"
+        )
+        self._conn.commit()
+
+    def _load_pool(self, dept, section_name):
+        key = (dept, section_name)
+        if key not in self._pools:
+            rows = self._conn.execute(
+                "SELECT payload FROM content_cache WHERE dept = ? AND section_name = ?", key
+            ).fetchall()
+            tasks = [task for (payload,) in rows for task in json.loads(payload)]
+            self._pools[key] = (len(rows), tasks)
+        return self._pools[key]
+
+    def get(self, dept, section_name, count):
+        with self._lock:
+            responses, tasks = self._load_pool(dept, section_name)
+            if responses < self.min_responses or not tasks:
+                return None
+
+            if not self.read_only:
+                self._touched[(dept, section_name)] = time.time()
+                if len(self._touched) >= TOUCH_FLUSH_EVERY:
+                    self._flush_touches()
+                    self._conn.commit()
+
+        if len(tasks) >= count:
+            return random.sample(tasks, count)
+        return random.choices(tasks, k=count)
+
+    def _flush_touches(self):
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE content_cache SET last_used = ? WHERE dept = ? AND section_name = ?",
+                [(last_used, dept, section_name) for (dept, section_name), last_used in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def put_many(self, entries):
+        if self.read_only:
+            return
+        now = time.time()
+        rows = [
+            (dept, section_name, len(tasks), json.dumps(tasks), now)
+            for dept, section_name, tasks in entries if tasks
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO content_cache (dept, section_name, task_count, payload, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            for dept, section_name, *_ in rows:
+                self._pools.pop((dept, section_name), None)
+            self._flush_touches()
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        (total,) = self._conn.execute("SELECT COUNT(*) FROM content_cache").fetchone()
+        overflow = total - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM content_cache WHERE id IN "
+                "(SELECT id FROM content_cache ORDER BY last_used ASC, id ASC LIMIT ?)",
+                (overflow,)
+            )
+            self._pools.clear()
+            logger.info(f"Evicted {overflow} cached content entries")
+
+    def close(self):
+        with self._lock:
+            if not self.read_only:
+                self._flush_touches()
+                self._conn.commit()
+            self._conn.close()
@@ -0,0 +1,119 @@
+import os
+import time
+import queue
+import logging
+import threading
+from utils.llm_client import _generate_mock_content
+from utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_DEPTH = int(os.environ.get("CONTENT_PREFETCH_DEPTH", 64))
+PREFETCH_WORKERS = int(os.environ.get("CONTENT_PREFETCH_WORKERS", 4))
+PREFETCH_REQUEST_COUNT = 8
+# Seconds a take() waits for a section's first batch, and for a dry queue
+# to refill, before padding with mock content.
+FIRST_FILL_TIMEOUT = float(os.environ.get("CONTENT_FIRST_FILL_TIMEOUT", 60.0))
+DRY_TIMEOUT = float(os.environ.get("CONTENT_DRY_TIMEOUT", 2.0))
+
+class ContentPool:
+    def __init__(self, engine, keys, depth=PREFETCH_DEPTH, workers=PREFETCH_WORKERS,
+                 request_count=PREFETCH_REQUEST_COUNT, dry_timeout=DRY_TIMEOUT,
+                 first_fill_timeout=FIRST_FILL_TIMEOUT):
+        self.engine = engine
+        self.keys = list(keys)
+        self.request_count = request_count
+        self.refill_below = max(1, depth - request_count + 1)
+        self.dry_timeout = dry_timeout
+        self.first_fill_timeout = first_fill_timeout
+        self.queues = {key: queue.Queue(maxsize=depth) for key in self.keys}
+        self._filled = {key: threading.Event() for key in self.keys}
+        self.fallbacks = 0
+        self.taken = 0
+        self.mocked = 0
+        self._workers = max(1, min(workers, len(self.keys) or 1))
+        self._threads = []
+        self._stop = threading.Event()
+
+    def start(self):
+        for i in range(self._workers):
+            thread = threading.Thread(
+                target=self._fill, args=(self.keys[i::self._workers],),
+                name=f"content-prefetch-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Prefetching content for {len(self.keys)} sections with {self._workers} workers")
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self.taken:
+            logger.info(
+                f"Content pool: {self.mocked}/{self.taken} tasks ({self.mocked / self.taken:.1%}) used mock "
+                f"content after {self.fallbacks} dry takes"
+            )
+
+    def _fill(self, keys):
+        while not self._stop.is_set():
+            hungry = [key for key in keys if self.queues[key].qsize() < self.refill_below]
+            if not hungry:
+                self._stop.wait(0.05)
+                continue
+
+            try:
+                batch = self.engine.generate_many(
+                    [(dept, section_name, self.request_count) for dept, section_name in hungry]
+                )
+            except Exception as e:
+                logger.warning(f"Content prefetch failed: {e}")
+                # Don't hold consumers for a first batch that isn't coming.
+                for key in hungry:
+                    self._filled[key].set()
+                self._stop.wait(1.0)
+                continue
+
+            for key, tasks in zip(hungry, batch):
+                for task in tasks:
+                    if not self._put(self.queues[key], task):
+                        return
+                self._filled[key].set()
+
+    def _put(self, q, task):
+        # Blocks while the consumer is behind, so workers never run ahead of
+        # the configured depth.
+        while not self._stop.is_set():
+            try:
+                q.put(task, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def take(self, dept, section_name, count):
+        q = self.queues.get((dept, section_name))
+        if q is None:
+            return self.engine.generate_many([(dept, section_name, count)])[0]
+
+        self._filled[(dept, section_name)].wait(self.first_fill_timeout)
+        deadline = time.monotonic() + self.dry_timeout
+        tasks = []
+        while len(tasks) < count:
+            try:
+                tasks.append(q.get(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                break
+
+        self.taken += count
+        if len(tasks) < count:
+            self.fallbacks += 1
+            self.mocked += count - len(tasks)
+            METRICS.inc("content_pool_fallbacks")
+            tasks.extend(_generate_mock_content(dept, section_name, count - len(tasks)))
+        return tasks
+
+    def generate_many(self, requests):
+        return [self.take(*request) for request in requests]
@@ -1,7 +1,57 @@
 import numpy as np
-import random
+from datetime import datetime, timezone
 
-def get_realistic_task_duration():
-    duration_days = np.random.lognormal(mean=0.5, sigma=0.8)
-    return max(0.1, min(60, duration_days))
+PRIORITIES = np.array(["Low", "Medium", "High"])
 
+MINUTE = np.timedelta64(60_000_000, 'us')
+HOUR = np.timedelta64(3_600_000_000, 'us')
+DAY_US = 86_400_000_000
+
+# Seeded runs pin "now" so regenerated timelines are identical.
+_reference_time = None
+
+def set_reference_time(reference_time):
+    global _reference_time
+    _reference_time = reference_time
+
+def get_reference_time():
+    return _reference_time
+
+def get_realistic_task_durations(size, rng=None):
+    rng = rng if rng is not None else np.random.default_rng()
+    return np.clip(rng.lognormal(mean=0.5, sigma=0.8, size=size), 0.1, 60)
+
+def _days(values):
+    return (np.asarray(values) * DAY_US).astype('timedelta64[us]')
+
+def generate_task_timeline(completion_probs, now=None, rng=None):
+    rng = rng if rng is not None else np.random.default_rng()
+    completion_probs = np.asarray(completion_probs, dtype=float)
+    size = len(completion_probs)
+
+    if now is None:
+        now = _reference_time or datetime.now(timezone.utc)
+    now = np.datetime64(now.replace(tzinfo=None), 'us')
+
+    created_at = now - _days(rng.integers(1, 91, size))
+    due_date = created_at + _days(get_realistic_task_durations(size, rng))
+
+    is_completed = rng.random(size) < completion_probs
+    completion_time = due_date + _days(rng.uniform(-2, 5, size))
+
+    # Same clamping order as the scalar generator: never before creation,
+    # then never in the future.
+    too_early = completion_time < created_at
+    completion_time = np.where(too_early, created_at + rng.integers(1, 25, size) * HOUR, completion_time)
+    too_late = completion_time > now
+    completion_time = np.where(too_late, now - rng.integers(10, 1001, size) * MINUTE, completion_time)
+
+    completed_at = np.where(is_completed, completion_time.astype(object), None)
+
+    return {
+        "created_at": created_at.tolist(),
+        "due_date": due_date.tolist(),
+        "is_completed": is_completed.tolist(),
+        "completed_at": completed_at.tolist(),
+        "priority": PRIORITIES[rng.integers(0, len(PRIORITIES), size)].tolist()
+    }
@@ -2,20 +2,27 @@ import os
 import logging
 import json
 import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.content_cache import ContentCache, CACHE_PATH
+from utils.metrics import METRICS
 
 logger = logging.getLogger(__name__)
 
-try:
-    import google.generativeai as genai
+def _load_genai():
+    # Imported and configured on first use: the library is slow to import
+    # and mock-only runs never need it.
     api_key = os.environ.get("GEMINI_API_KEY")
-    if api_key:
-        genai.configure(api_key=api_key)
-        HAS_GEMINI_LIB = True
-    else:
-        HAS_GEMINI_LIB = False
-except ImportError:
-    HAS_GEMINI_LIB = False
-    logger.warning("google-generativeai not installed. Using mock data.")
+    if not api_key:
+        return None
+    try:
+        import google.generativeai as genai
+    except ImportError:
+        logger.warning("google-generativeai not installed. Using mock data.")
+        return None
+    genai.configure(api_key=api_key)
+    return genai
 
 MOCK_TASKS = {
     "Engineering": [
@@ -34,38 +41,214 @@ MOCK_TASKS = {
     ]
 }
 
-def generate_task_content(dept, section_name, count=3):
-    if HAS_GEMINI_LIB and os.environ.get("GEMINI_API_KEY"):
+MAX_IN_FLIGHT = int(os.environ.get("GEMINI_MAX_IN_FLIGHT", 8))
+REQUESTS_PER_SECOND = float(os.environ.get("GEMINI_REQUESTS_PER_SECOND", 5))
+MAX_RETRIES = int(os.environ.get("GEMINI_MAX_RETRIES", 3))
+PROMPTS_PER_REQUEST = int(os.environ.get("GEMINI_PROMPTS_PER_REQUEST", 5))
+
+_model = None
+_engine = None
+_engine_lock = threading.Lock()
+_requests_per_second = REQUESTS_PER_SECOND
+_cache_read_only = False
+_cache_enabled = not os.environ.get("GEMINI_CONTENT_CACHE_DISABLED")
+
+def _get_model():
+    global _model
+    if _model is None:
+        genai = _load_genai()
+        if genai is not None:
+            _model = genai.GenerativeModel('gemini-pro')
+    return _model
+
+class ContentEngine:
+    def __init__(self, model=None, cache=None, max_in_flight=MAX_IN_FLIGHT, requests_per_second=REQUESTS_PER_SECOND,
+                 max_retries=MAX_RETRIES, prompts_per_request=PROMPTS_PER_REQUEST, backoff_base=0.5):
+        self.model = model
+        self.cache = cache
+        self.max_retries = max_retries
+        self.prompts_per_request = max(1, prompts_per_request)
+        self.backoff_base = backoff_base
+        self._next_slot = 0.0
+        self._rate_lock = threading.Lock()
+        self.set_rate_limit(requests_per_second)
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="gemini")
+
+    def set_rate_limit(self, requests_per_second):
+        self._interval = 1.0 / requests_per_second if requests_per_second else 0.0
+
+    def _wait_for_slot(self):
+        if not self._interval:
+            return
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _call_with_retry(self, prompt):
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_slot()
+            METRICS.inc("llm_calls")
+            try:
+                with METRICS.timer("llm_request"):
+                    return self.model.generate_content(prompt).text
+            except Exception as e:
+                METRICS.inc("llm_errors")
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff_base * (2 ** attempt) * (1 + random.random())
+                logger.warning(f"Gemini request failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _run_pack(self, pack):
         try:
-            return _generate_llm_content(dept, section_name, count)
+            raw_content = self._call_with_retry(_build_prompt(pack))
+            parsed = _parse_response(raw_content, len(pack))
         except Exception as e:
             logger.warning(f"Gemini API Error (Switching to Mock): {e}")
-            return _generate_mock_content(dept, section_name, count)
-    else:
-        return _generate_mock_content(dept, section_name, count)
+            parsed = [None] * len(pack)
+
+        results = []
+        for (dept, section_name, count), tasks in zip(pack, parsed):
+            if tasks:
+                results.append((tasks[:count], True))
+            else:
+                METRICS.inc("llm_fallbacks")
+                results.append((_generate_mock_content(dept, section_name, count), False))
+        return results
+
+    def generate_many(self, requests):
+        requests = list(requests)
+        results = [None] * len(requests)
+
+        misses = []
+        for i, (dept, section_name, count) in enumerate(requests):
+            cached = self.cache.get(dept, section_name, count) if self.cache else None
+            if cached is not None:
+                results[i] = cached
+            else:
+                misses.append(i)
+        METRICS.inc("content_cache_hits", len(requests) - len(misses))
+        METRICS.inc("content_cache_misses", len(misses))
+
+        if self.model is None:
+            METRICS.inc("mock_content", len(misses))
+            for i in misses:
+                results[i] = _generate_mock_content(*requests[i])
+            return results
+
+        packs = [
+            misses[j:j + self.prompts_per_request]
+            for j in range(0, len(misses), self.prompts_per_request)
+        ]
+        futures = [
+            self._executor.submit(self._run_pack, [requests[i] for i in pack])
+            for pack in packs
+        ]
 
-def _generate_llm_content(dept, section_name, count):
-    model = genai.GenerativeModel('gemini-pro')
+        fresh = []
+        for pack, future in zip(packs, futures):
+            for i, (tasks, from_llm) in zip(pack, future.result()):
+                results[i] = tasks
+                if from_llm:
+                    dept, section_name, _ = requests[i]
+                    fresh.append((dept, section_name, tasks))
 
-    prompt = (
-        f"Generate {count} realistic, short task titles and 1-sentence descriptions "
-        f"for a '{dept}' team. The tasks are currently in the '{section_name}' stage.\n"
-        f"Return ONLY a raw JSON list of objects with keys 'title' and 'description'. "
+        if self.cache and fresh:
+            self.cache.put_many(fresh)
+        return results
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        if self.cache:
+            self.cache.close()
+
+def get_content_engine():
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            model = _get_model()
+            if not _cache_enabled:
+                cache = None
+            elif _cache_read_only or model is None:
+                # Without a model the cache is only read, so don't create an empty one.
+                cache = ContentCache(read_only=_cache_read_only) if os.path.exists(CACHE_PATH) else None
+            else:
+                cache = ContentCache()
+            _engine = ContentEngine(model=model, cache=cache, requests_per_second=_requests_per_second)
+        return _engine
+
+def disable_content_cache():
+    global _cache_enabled
+    _cache_enabled = False
+    # Spawned shard workers pick this up at import time.
+    os.environ["GEMINI_CONTENT_CACHE_DISABLED"] = "1"
+
+def set_cache_read_only(read_only=True):
+    # Shard workers share the cache file with each other and the parent;
+    # only the parent writes to it.
+    global _cache_read_only
+    _cache_read_only = read_only
+
+def set_rate_limit(requests_per_second):
+    # The limiter is per process, so parallel shard workers each get a share
+    # of the overall limit.
+    global _requests_per_second
+    with _engine_lock:
+        _requests_per_second = requests_per_second
+        if _engine is not None:
+            _engine.set_rate_limit(requests_per_second)
+
+def generate_task_content_batch(requests):
+    return get_content_engine().generate_many(requests)
+
+def _build_prompt(pack):
+    if len(pack) == 1:
+        dept, section_name, count = pack[0]
+        return (
+            f"Generate {count} realistic, short task titles and 1-sentence descriptions "
+            f"for a '{dept}' team. The tasks are currently in the '{section_name}' stage.\n"
+            f"Return ONLY a raw JSON list of objects with keys 'title' and 'description'. "
+            f"Do not use Markdown formatting."
+        )
+
+    groups = "\n".join(
+        f"{i}. {count} tasks for a '{dept}' team, currently in the '{section_name}' stage."
+        for i, (dept, section_name, count) in enumerate(pack)
+    )
+    return (
+        f"Generate realistic, short task titles and 1-sentence descriptions for each of "
+        f"the following {len(pack)} groups:\n{groups}\n"
+        f"Return ONLY a raw JSON list with exactly {len(pack)} elements, in the same order. "
+        f"Each element is a list of objects with keys 'title' and 'description'. "
         f"Do not use Markdown formatting."
     )
 
+def _parse_response(raw_content, expected):
+    raw_content = raw_content.strip()
+    if raw_content.startswith("```"):
+        raw_content = raw_content.replace("```json", "").replace("```", "")
+
     try:
-        response = model.generate_content(prompt)
-        raw_content = response.text.strip()
-        
-        if raw_content.startswith("```"):
-            raw_content = raw_content.replace("```json", "").replace("```", "")
-
-        tasks = json.loads(raw_content)
-        return tasks[:count]
+        data = json.loads(raw_content)
     except Exception:
         raise ValueError("Invalid API Response")
 
+    if expected == 1:
+        data = [data]
+    if not isinstance(data, list):
+        raise ValueError("Invalid API Response")
+
+    groups = []
+    for group in data[:expected]:
+        valid = isinstance(group, list) and all(
+            isinstance(t, dict) and 'title' in t and 'description' in t for t in group
+        )
+        groups.append(group if valid else None)
+    return groups + [None] * (expected - len(groups))
+
 def _generate_mock_content(dept, section_name, count):
     key = next((k for k in MOCK_TASKS.keys() if k in dept), "General")
     base_list = MOCK_TASKS.get(key)
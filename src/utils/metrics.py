@@ -0,0 +1,244 @@
+import io
+import re
+import json
+import sys
+import time
+import logging
+import threading
+import functools
+from contextlib import contextmanager
+from sqlalchemy import event
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak RSS is then reported as None.
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+METRICS_FORMATS = ["json", "prometheus"]
+METRIC_PREFIX = "asana_gen"
+HISTOGRAM_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+_TABLE_PATTERN = re.compile(
+    r"^\s*(?:INSERT\s+(?:OR\s+\w+\s+)?INTO|UPDATE|DELETE\s+FROM|SELECT\b.*?\bFROM)\s+[\"`]?(\w+)",
+    re.IGNORECASE | re.DOTALL
+)
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS.
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+class MetricsRegistry:
+    def __init__(self, buckets=HISTOGRAM_BUCKETS):
+        self.buckets = buckets
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = {"buckets": [0] * len(self.buckets), "count": 0, "sum": 0.0}
+                self.histograms[name] = histogram
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram["buckets"][i] += 1
+            histogram["count"] += 1
+            histogram["sum"] += seconds
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name):
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+                "histograms": {
+                    name: {"buckets": list(h["buckets"]), "count": h["count"], "sum": h["sum"]}
+                    for name, h in sorted(self.histograms.items())
+                }
+            }
+
+    def reset(self):
+        with self._lock:
+            self.counters = {}
+            self.histograms = {}
+
+    def merge(self, snapshot):
+        # Folds in a snapshot taken in another process (e.g. a shard worker).
+        for counter in snapshot["counters"]:
+            self.inc(counter["name"], counter["value"], **counter["labels"])
+        with self._lock:
+            for name, other in snapshot["histograms"].items():
+                histogram = self.histograms.setdefault(
+                    name, {"buckets": [0] * len(self.buckets), "count": 0, "sum": 0.0}
+                )
+                histogram["buckets"] = [a + b for a, b in zip(histogram["buckets"], other["buckets"])]
+                histogram["count"] += other["count"]
+                histogram["sum"] += other["sum"]
+
+METRICS = MetricsRegistry()
+
+class StatementCounter:
+    def __init__(self, registry=METRICS):
+        self.count = 0
+        self.registry = registry
+        self._tables = {}
+
+    def attach(self, engine):
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        return self
+
+    def _table(self, statement):
+        table = self._tables.get(statement)
+        if table is None:
+            match = _TABLE_PATTERN.match(statement)
+            table = match.group(1) if match else "other"
+            self._tables[statement] = table
+        return table
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        if self.registry is not None:
+            self.registry.inc("sql_statements", table=self._table(statement))
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.registry is not None and cursor.rowcount > 0:
+            self.registry.inc("sql_rows", cursor.rowcount, table=self._table(statement))
+
+class StageReport:
+    def __init__(self, statement_counter=None):
+        self.statement_counter = statement_counter
+        self.stages = []
+        self._by_name = {}
+
+    def _record(self, name):
+        if name not in self._by_name:
+            record = {"stage": name, "rows": 0, "seconds": 0.0, "statements": 0, "calls": 0}
+            self._by_name[name] = record
+            self.stages.append(record)
+        return self._by_name[name]
+
+    @contextmanager
+    def stage(self, name, quiet=False):
+        # Re-entering a stage name accumulates into the same record, so
+        # per-call spans (e.g. one per project) add up to a stage total.
+        record = self._record(name)
+        span = {"rows": 0}
+        statements_before = self.statement_counter.count if self.statement_counter else 0
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            record["seconds"] += time.perf_counter() - start
+            record["rows"] += span["rows"]
+            record["calls"] += 1
+            if self.statement_counter:
+                record["statements"] += self.statement_counter.count - statements_before
+            record["rows_per_sec"] = record["rows"] / record["seconds"] if record["seconds"] else 0.0
+            record["peak_rss_mb"] = peak_rss_mb()
+            if not quiet:
+                logger.info(
+                    f"   -> {name}: {record['rows']} rows in {record['seconds']:.2f}s "
+                    f"({record['rows_per_sec']:.0f} rows/sec)"
+                )
+
+    def lines(self):
+        return [
+            f"{r['stage']:<14}{r['rows']:>10} rows {r['seconds']:>8.2f}s {r['rows_per_sec']:>10.0f} rows/sec"
+            for r in self.stages
+        ]
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+def prometheus_text(snapshot, stages=(), buckets=HISTOGRAM_BUCKETS):
+    lines = []
+    seen = set()
+    for counter in snapshot["counters"]:
+        name = f"{METRIC_PREFIX}_{counter['name']}_total"
+        if name not in seen:
+            lines.append(f"# TYPE {name} counter")
+            seen.add(name)
+        lines.append(f"{name}{_labels(counter['labels'])} {counter['value']}")
+
+    if snapshot["histograms"]:
+        name = f"{METRIC_PREFIX}_call_seconds"
+        lines.append(f"# TYPE {name} histogram")
+        for call, histogram in snapshot["histograms"].items():
+            for bound, count in zip(buckets, histogram["buckets"]):
+                lines.append(f"{name}_bucket{_labels({'call': call, 'le': bound})} {count}")
+            lines.append(f"{name}_bucket{_labels({'call': call, 'le': '+Inf'})} {histogram['count']}")
+            lines.append(f"{name}_sum{_labels({'call': call})} {histogram['sum']:.6f}")
+            lines.append(f"{name}_count{_labels({'call': call})} {histogram['count']}")
+
+    for field in ("seconds", "rows", "statements"):
+        name = f"{METRIC_PREFIX}_stage_{field}"
+        lines.append(f"# TYPE {name} gauge")
+        for record in stages:
+            lines.append(f"{name}{_labels({'stage': record['stage']})} {record[field]}")
+    return "\n".join(lines) + "\n"
+
+def write_metrics(path, report=None, fmt="json", registry=METRICS):
+    if fmt not in METRICS_FORMATS:
+        raise ValueError(f"Unknown metrics format '{fmt}'. Choose from {METRICS_FORMATS}")
+
+    snapshot = registry.snapshot()
+    stages = report.stages if report is not None else []
+    with open(path, "w") as f:
+        if fmt == "prometheus":
+            f.write(prometheus_text(snapshot, stages, registry.buckets))
+        else:
+            json.dump({"buckets": list(registry.buckets), "stages": stages, **snapshot}, f, indent=2)
+    logger.info(f"Wrote {fmt} metrics to {path}")
+
+@contextmanager
+def profiled(path=None, top=20):
+    if not path:
+        yield
+        return
+
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(top)
+        logger.info(f"Profile written to {path}\n{summary.getvalue()}")
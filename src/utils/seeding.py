@@ -0,0 +1,20 @@
+import zlib
+import random
+import numpy as np
+from models.database import seed_keys
+
+def derive_seed_sequence(seed, *keys):
+    # Keys are hashed rather than enumerated, so a team's stream depends only
+    # on the base seed and the team's name, not on shard layout or run order.
+    entropy = [seed] + [zlib.crc32(str(key).encode("utf-8")) for key in keys]
+    return np.random.SeedSequence(entropy)
+
+def seed_stream(seed, *keys):
+    if seed is None:
+        return np.random.default_rng()
+
+    seed_seq = derive_seed_sequence(seed, *keys)
+    python_seed, key_seed = seed_seq.generate_state(2).tolist()
+    random.seed(python_seed)
+    seed_keys(key_seed)
+    return np.random.default_rng(seed_seq)
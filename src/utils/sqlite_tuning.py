@@ -0,0 +1,53 @@
+import logging
+from sqlalchemy import create_engine, event
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_PRAGMAS = {"journal_mode", "synchronous", "cache_size", "temp_store", "locking_mode", "mmap_size"}
+
+SQLITE_PROFILES = {
+    "default": {},
+    "bulk": {
+        "journal_mode": "MEMORY",
+        "synchronous": "OFF",
+        "cache_size": -262144,
+        "temp_store": "MEMORY"
+    }
+}
+
+def resolve_pragmas(profile="default", overrides=None):
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile '{profile}'. Choose from {sorted(SQLITE_PROFILES)}")
+
+    pragmas = dict(SQLITE_PROFILES[profile])
+    pragmas.update(overrides or {})
+
+    unknown = set(pragmas) - ALLOWED_PRAGMAS
+    if unknown:
+        raise ValueError(f"Unsupported PRAGMA(s): {sorted(unknown)}")
+    return pragmas
+
+def parse_pragma_overrides(items):
+    overrides = {}
+    for item in items or []:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Expected PRAGMA as key=value, got '{item}'")
+        overrides[key.strip()] = value.strip()
+    return overrides
+
+def create_tuned_engine(url, pragmas=None):
+    engine = create_engine(url)
+    pragmas = pragmas or {}
+
+    if pragmas:
+        @event.listens_for(engine, "connect")
+        def _apply_pragmas(dbapi_connection, _):
+            cursor = dbapi_connection.cursor()
+            for key, value in pragmas.items():
+                cursor.execute(f"PRAGMA {key}={value}")
+            cursor.close()
+
+        logger.info(f"SQLite PRAGMAs: {pragmas}")
+
+    return engine
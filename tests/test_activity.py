@@ -0,0 +1,38 @@
+import os
+import sqlite3
+from datetime import datetime
+
+import main as pipeline
+
+AS_OF = datetime(2026, 1, 1)
+TEAM_EVENTS = """
+    SELECT e.task_id, e.event_type, e.occurred_at, e.actor_id, e.section_id, e.assignee_id, e.detail
+    FROM task_events e
+    JOIN tasks t ON t.id = e.task_id
+    JOIN projects p ON p.id = t.project_id
+    JOIN teams tm ON tm.id = p.team_id
+    WHERE tm.name = ?
+    ORDER BY e.task_id, e.occurred_at, e.event_type
+"""
+
+def _team_events(db_file, team_name):
+    conn = sqlite3.connect(db_file)
+    try:
+        return conn.execute(TEAM_EVENTS, (team_name,)).fetchall()
+    finally:
+        conn.close()
+
+def test_regenerated_team_gets_the_same_history(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("output")
+    db_file = os.path.join("output", "activity.sqlite")
+    pipeline.main(seed=9, as_of=AS_OF, num_users=80, db_file=db_file, company_name="Acme", activity=True)
+    team_name = "Marketing - Squad 1"
+    before = _team_events(db_file, team_name)
+
+    # The regenerated team's tasks land in a different chunk, with other
+    # neighbours, than in the first run.
+    pipeline.main(seed=9, as_of=AS_OF, db_file=db_file, regenerate_teams={team_name}, activity=True)
+
+    assert before
+    assert _team_events(db_file, team_name) == before
@@ -0,0 +1,46 @@
+import os
+import json
+import sqlite3
+
+from batch import load_org_specs, run_batch
+
+def _write_specs(tmp_path, data):
+    path = tmp_path / "orgs.json"
+    path.write_text(json.dumps(data))
+    return str(path)
+
+def test_count_and_default_seeds_are_distinct(tmp_path):
+    path = _write_specs(tmp_path, {
+        "defaults": {"seed": 7},
+        "orgs": [{"name": "Initech", "count": 2}, {"name": "Globex", "seed": 100, "count": 2}]
+    })
+
+    seeds = {spec["name"]: spec["seed"] for spec in load_org_specs(path)}
+
+    assert seeds == {"Initech 1": 7, "Initech 2": 8, "Globex 1": 100, "Globex 2": 101}
+
+def test_shared_db_merges_every_org(tmp_path):
+    path = _write_specs(tmp_path, {
+        "defaults": {"users": 40, "team_size": 8},
+        "orgs": [{"name": "Initech", "count": 2}]
+    })
+    out_dir = str(tmp_path / "out")
+    shared_db = os.path.join(out_dir, "all.sqlite")
+
+    manifest = run_batch(load_org_specs(path, base_seed=3), out_dir=out_dir, workers=2, shared_db=shared_db)
+
+    assert manifest["orgs_ok"] == 2
+    assert manifest["shared_db_size_mb"] > 0
+    assert sorted(os.listdir(out_dir)) == ["all.sqlite", "manifest.json"]
+
+    conn = sqlite3.connect(shared_db)
+    try:
+        orgs = [name for (name,) in conn.execute("SELECT name FROM organizations ORDER BY name")]
+        (tasks,) = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()
+        indexes = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    finally:
+        conn.close()
+
+    assert orgs == ["Initech 1", "Initech 2"]
+    assert tasks == sum(org["tasks"] for org in manifest["orgs"])
+    assert "idx_tasks_project" in indexes
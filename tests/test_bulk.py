@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+
+from models.database import Base
+from utils.bulk import ChunkedWriter
+
+class RecordingSink:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, table, rows):
+        self.writes.append((table.name, [row["id"] for row in rows]))
+
+def test_full_buffer_flushes_parent_tables_first():
+    sink = RecordingSink()
+    writer = ChunkedWriter(SimpleNamespace(info={"row_sink": sink}), chunk_size=2)
+    projects, sections, tasks = (Base.metadata.tables[name] for name in ("projects", "sections", "tasks"))
+
+    writer.add(projects, {"id": "p1"})
+    writer.add(sections, {"id": "s1"})
+    writer.add(tasks, {"id": "t1"})
+    writer.add(tasks, {"id": "t2"})
+    writer.add(sections, {"id": "s2"})
+    assert (writer.rows_added, writer.rows_written) == (5, 4)
+    writer.flush()
+
+    assert sink.writes == [
+        ("projects", ["p1"]),
+        ("sections", ["s1"]),
+        ("tasks", ["t1", "t2"]),
+        ("sections", ["s2"]),
+    ]
+    assert writer.rows_written == 5
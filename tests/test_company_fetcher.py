@@ -0,0 +1,29 @@
+import json
+import logging
+
+from scrapers import company_fetcher
+
+LONG_AGO = "2000-01-01T00:00:00+00:00"
+
+def _write_catalog(path, fetched_at):
+    path.write_text(json.dumps({
+        "source": "test",
+        "fetched_at": fetched_at,
+        "companies": [{"name": "Initech", "domain": "initech.com"}]
+    }))
+    return str(path)
+
+def test_shipped_catalog_never_warns_about_age(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(company_fetcher, "LOCAL_CATALOG", str(tmp_path / "missing.json"))
+    monkeypatch.setattr(company_fetcher, "SHIPPED_CATALOG", _write_catalog(tmp_path / "shipped.json", LONG_AGO))
+
+    with caplog.at_level(logging.INFO):
+        assert company_fetcher.load_company_catalog()[0]["name"] == "Initech"
+    assert "older than" not in caplog.text
+
+def test_stale_local_catalog_warns(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(company_fetcher, "LOCAL_CATALOG", _write_catalog(tmp_path / "local.json", LONG_AGO))
+
+    with caplog.at_level(logging.INFO):
+        company_fetcher.load_company_catalog()
+    assert "older than" in caplog.text
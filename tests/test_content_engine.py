@@ -0,0 +1,82 @@
+import re
+import json
+
+from utils.llm_client import ContentEngine, MOCK_TASKS, _build_prompt
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+class FakeModel:
+    # Answers every group of a prompt with titled tasks, after failing the
+    # first `failures` calls.
+    def __init__(self, failures=0, reply=None):
+        self.failures = failures
+        self.reply = reply
+        self.prompts = []
+
+    def generate_content(self, prompt):
+        self.prompts.append(prompt)
+        if len(self.prompts) <= self.failures:
+            raise RuntimeError("quota exceeded")
+        if self.reply is not None:
+            return FakeResponse(self.reply)
+
+        match = re.search(r"the following (\d+) groups", prompt)
+        if match is None:
+            count = int(re.search(r"Generate (\d+) realistic", prompt).group(1))
+            return FakeResponse(json.dumps(_tasks(0, count)))
+        counts = [int(n) for n in re.findall(r"^\d+\. (\d+) tasks", prompt, re.MULTILINE)]
+        return FakeResponse(json.dumps([_tasks(group, count) for group, count in enumerate(counts)]))
+
+def _tasks(group, count):
+    return [{"title": f"LLM task {group}.{i}", "description": "From the model."} for i in range(count)]
+
+def _engine(model, **kwargs):
+    kwargs.setdefault("requests_per_second", 0)
+    kwargs.setdefault("backoff_base", 0)
+    return ContentEngine(model=model, **kwargs)
+
+def test_requests_are_packed_into_prompts():
+    model = FakeModel()
+    engine = _engine(model, prompts_per_request=2)
+    requests = [("Engineering", "To Do", 2), ("Marketing", "Done", 3), ("Engineering", "Review", 1)]
+
+    results = engine.generate_many(requests)
+    engine.close()
+
+    assert len(model.prompts) == 2
+    assert sorted(model.prompts) == sorted([_build_prompt(requests[:2]), _build_prompt(requests[2:])])
+    assert [len(tasks) for tasks in results] == [2, 3, 1]
+    assert all(task["title"].startswith("LLM task") for tasks in results for task in tasks)
+
+def test_failed_calls_are_retried():
+    model = FakeModel(failures=2)
+    engine = _engine(model, max_retries=3)
+
+    (tasks,) = engine.generate_many([("Engineering", "To Do", 3)])
+    engine.close()
+
+    assert len(model.prompts) == 3
+    assert [task["title"] for task in tasks] == ["LLM task 0.0", "LLM task 0.1", "LLM task 0.2"]
+
+def test_exhausted_retries_fall_back_to_mock_content():
+    model = FakeModel(failures=10)
+    engine = _engine(model, max_retries=2)
+
+    (tasks,) = engine.generate_many([("Engineering", "To Do", 4)])
+    engine.close()
+
+    assert len(model.prompts) == 3
+    assert len(tasks) == 4
+    assert all(task["title"].split(" (")[0] in MOCK_TASKS["Engineering"] for task in tasks)
+
+def test_invalid_groups_fall_back_to_mock_content():
+    reply = json.dumps([_tasks(0, 2), "not a task list"])
+    engine = _engine(FakeModel(reply=reply), prompts_per_request=2)
+
+    first, second = engine.generate_many([("Engineering", "To Do", 2), ("Marketing", "Done", 2)])
+    engine.close()
+
+    assert [task["title"] for task in first] == ["LLM task 0.0", "LLM task 0.1"]
+    assert all(task["title"].split(" (")[0] in MOCK_TASKS["Marketing"] for task in second)
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from exporters.copy_loader import CopyLoader, FileCopyTarget, copy_value, encode_copy_rows
+from models.database import Base
+
+def test_copy_text_encoding():
+    assert copy_value(None) == "\\N"
+    assert copy_value(True) == "t"
+    assert copy_value(False) == "f"
+    assert copy_value(b"\x01\xab") == "\\\\x01ab"
+    assert copy_value(datetime(2026, 1, 2, 3, 4, 5)) == "2026-01-02 03:04:05"
+    assert copy_value("a\tb\nc\rd\\e") == "a\\tb\\nc\\rd\\\\e"
+    assert copy_value(3) == "3"
+
+    rows = [{"id": 1, "name": "x\ty", "note": None}, {"id": 2, "name": "z", "note": "n"}]
+    assert encode_copy_rows(["id", "name", "note"], rows) == "1\tx\\ty\t\\N\n2\tz\tn\n"
+
+def test_file_target_writes_copy_files_and_load_script(tmp_path):
+    users = Base.metadata.tables["users"]
+    loader = CopyLoader(FileCopyTarget(str(tmp_path)), workers=2, batch_rows=1)
+    loader.write(users, [
+        {"id": "u1", "org_id": None, "full_name": "Ann\tLee", "email": "ann@x.com", "role": "Dev",
+         "is_active": True, "created_at": datetime(2026, 1, 1)},
+        {"id": "u2", "org_id": "o1", "full_name": "Bo", "email": "bo@x.com", "role": None,
+         "is_active": False, "created_at": datetime(2026, 1, 2)},
+    ])
+    loader.close()
+
+    columns = [c.name for c in users.columns]
+    assert columns == ["id", "org_id", "full_name", "email", "role", "is_active", "created_at"]
+    payload = (tmp_path / "users.copy").read_text(encoding="utf-8")
+    assert sorted(payload.splitlines()) == [
+        "\t".join(["u1", "\\N", "Ann\\tLee", "ann@x.com", "Dev", "t", "2026-01-01 00:00:00"]),
+        "\t".join(["u2", "o1", "Bo", "bo@x.com", "\\N", "f", "2026-01-02 00:00:00"]),
+    ]
+
+    script = (tmp_path / "load.sql").read_text(encoding="utf-8").splitlines()
+    copies = [line for line in script if line.startswith("\\copy")]
+    assert copies == [f"\\copy users ({', '.join(columns)}) FROM 'users.copy'"]
+    assert script[0] == "BEGIN;" and script[-1] == "COMMIT;"
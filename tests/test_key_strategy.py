@@ -0,0 +1,29 @@
+import uuid
+import sqlite3
+
+import pytest
+
+from models.database import check_key_strategy, detect_key_strategy
+
+def _org_table(declared_type, key=None):
+    conn = sqlite3.connect(":memory:")
+    conn.execute(f"CREATE TABLE organizations (id {declared_type} PRIMARY KEY, name VARCHAR)")
+    if key is not None:
+        conn.execute("INSERT INTO organizations VALUES (?, 'Acme')", (key,))
+    return conn
+
+def test_detects_the_stored_key_layout():
+    uuid7 = "0190b6c1-5f3a-7cde-8f01-23456789abcd"
+    assert detect_key_strategy(_org_table("INTEGER", 1)) == "integer"
+    assert detect_key_strategy(_org_table("BLOB", uuid.UUID(uuid7).bytes)) == "blob"
+    assert detect_key_strategy(_org_table("VARCHAR", str(uuid.uuid4()))) == "uuid4"
+    assert detect_key_strategy(_org_table("VARCHAR", uuid7)) == "uuid7"
+    assert detect_key_strategy(_org_table("VARCHAR")) is None
+    assert detect_key_strategy(sqlite3.connect(":memory:")) is None
+
+def test_explicit_strategy_must_match_the_file():
+    assert check_key_strategy("integer") == "integer"
+    assert check_key_strategy("integer", "integer") == "integer"
+    assert check_key_strategy(None, "uuid7") == "uuid7"
+    with pytest.raises(ValueError):
+        check_key_strategy("integer", "uuid4")
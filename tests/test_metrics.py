@@ -0,0 +1,6 @@
+from utils import metrics
+
+def test_peak_rss_is_none_without_resource(monkeypatch):
+    assert metrics.peak_rss_mb() > 0
+    monkeypatch.setattr(metrics, "resource", None)
+    assert metrics.peak_rss_mb() is None
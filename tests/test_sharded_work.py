@@ -0,0 +1,38 @@
+import os
+import sqlite3
+from datetime import datetime
+
+import main as pipeline
+
+AS_OF = datetime(2026, 1, 1)
+COMPARED = {
+    "projects": "id, team_id, name",
+    "sections": "id, project_id, name",
+    "tasks": "id, project_id, section_id, assignee_id, name, created_at, due_date, completed_at",
+    "custom_field_values": "id, task_id, field_definition_id, value_text, value_number",
+}
+
+def _generate(workers):
+    db_file = os.path.join("output", f"workers_{workers}.sqlite")
+    summary = pipeline.main(
+        workers=workers, seed=3, as_of=AS_OF, num_users=60, db_file=db_file, company_name="Acme"
+    )
+    return db_file, summary
+
+def _rows(db_file, table):
+    conn = sqlite3.connect(db_file)
+    try:
+        return sorted(conn.execute(f"SELECT {COMPARED[table]} FROM {table}").fetchall())
+    finally:
+        conn.close()
+
+def test_sharded_run_matches_serial_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("output")
+    serial_db, serial = _generate(workers=1)
+    sharded_db, sharded = _generate(workers=2)
+
+    assert sharded["tasks"] == serial["tasks"] > 0
+    for table in COMPARED:
+        assert _rows(sharded_db, table) == _rows(serial_db, table), table
+    assert os.listdir(pipeline.SHARD_DIR) == []